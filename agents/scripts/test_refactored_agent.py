@@ -4,10 +4,20 @@ Test script for the refactored project intelligence agent.
 This script tests the agent locally without deploying to AWS.
 """
 
-import json
+import asyncio
+import logging
 import sys
+
+import orjson
+
 from src.project_intelligence_agent import analyze_project
 
+# Dedicated plain-message handler; messages are only formatted when emitted
+logger = logging.getLogger("pia.smoke_test")
+logger.addHandler(logging.StreamHandler(sys.stdout))
+logger.setLevel(logging.INFO)
+logger.propagate = False
+
 
 def test_analyze_project():
     """Test the analyze_project function with a sample repository."""
@@ -15,35 +25,33 @@ def test_analyze_project():
     # Test with a well-known repository
     test_payload = {"repository_url": "https://github.com/strands-agents/sdk-python"}
 
-    print("Testing refactored agent with GitHub MCP server...")
-    print(f"Repository: {test_payload['repository_url']}")
-    print("-" * 80)
+    logger.info("Testing refactored agent with GitHub MCP server...")
+    logger.info("Repository: %s", test_payload["repository_url"])
+    logger.info("-" * 80)
 
     try:
-        result = analyze_project(test_payload)
+        result = asyncio.run(analyze_project(test_payload))
 
-        print("\nResult:")
-        print(json.dumps(result, indent=2))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("\nResult:")
+            logger.info(orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())
 
         if result.get("status") == "completed":
-            print("\n✅ Test PASSED - Analysis completed successfully")
+            logger.info("\n✅ Test PASSED - Analysis completed successfully")
 
             analysis = result.get("analysis", {})
-            print(f"\nSummary: {analysis.get('summary', 'N/A')}")
-            print(f"Tech Stack Count: {len(analysis.get('tech_stack', []))}")
-            print(f"Confidence Score: {analysis.get('confidence_score', 0)}")
+            logger.info("\nSummary: %s", analysis.get("summary", "N/A"))
+            logger.info("Tech Stack Count: %d", len(analysis.get("tech_stack", [])))
+            logger.info("Confidence Score: %s", analysis.get("confidence_score", 0))
 
             return 0
         else:
-            print("\n❌ Test FAILED - Analysis did not complete")
-            print(f"Error: {result.get('error', 'Unknown error')}")
+            logger.error("\n❌ Test FAILED - Analysis did not complete")
+            logger.error("Error: %s", result.get("error", "Unknown error"))
             return 1
 
-    except Exception as e:
-        print(f"\n❌ Test FAILED with exception: {str(e)}")
-        import traceback
-
-        traceback.print_exc()
+    except Exception:
+        logger.exception("\n❌ Test FAILED with exception")
         return 1
 
 
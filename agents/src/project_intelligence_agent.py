@@ -7,22 +7,36 @@ generate summaries, and categorize projects using Amazon Bedrock Nova models.
 Refactored to use the official GitHub MCP server for better maintainability.
 """
 
+import asyncio
+import atexit
 import json
 import logging
 import os
-import re
+import threading
+import time
 import uuid
-from datetime import datetime, timezone
+from collections.abc import Callable
+from datetime import UTC, datetime
+from functools import lru_cache
 from logging import Logger
-from typing import Any
-
+from string import Template
+from typing import Any, Literal
+from urllib.parse import urlsplit
+
+import anyio
+import boto3
+import httpx
+import orjson
 from bedrock_agentcore.runtime import BedrockAgentCoreApp
-from boto3 import session
 from botocore.exceptions import ClientError
 from dotenv import find_dotenv, load_dotenv
 from mcp.client.streamable_http import streamablehttp_client
+from mcp.shared.exceptions import McpError
+from pydantic import BaseModel, Field
 from strands import Agent
+from strands.models import BedrockModel
 from strands.tools.mcp import MCPClient
+from strands.types.exceptions import MCPClientInitializationError
 
 # Configure logging for CloudWatch
 logging.basicConfig(
@@ -35,8 +49,202 @@ load_dotenv(find_dotenv())
 # Initialize BedrockAgentCoreApp
 app = BedrockAgentCoreApp()
 
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+GITHUB_HOSTS = frozenset({"github.com", "www.github.com"})
+
+BEDROCK_MODEL_ID = "us.amazon.nova-micro-v1:0"
+
+# Bedrock latency-optimized inference; only some models and regions support
+# it, so it is opt-in via BEDROCK_LATENCY_OPTIMIZED=true
+BEDROCK_LATENCY_OPTIMIZED = os.environ.get(
+    "BEDROCK_LATENCY_OPTIMIZED", "false"
+).lower() in ("1", "true", "yes")
+
+# One boto3 session for the process; credential and config resolution
+# happens once instead of for every client
+boto_session = boto3.Session()
+
+# Shared by every Agent so the Bedrock runtime client is built once
+bedrock_model = BedrockModel(
+    boto_session=boto_session,
+    model_id=BEDROCK_MODEL_ID,
+    additional_args=(
+        {"performanceConfig": {"latency": "optimized"}}
+        if BEDROCK_LATENCY_OPTIMIZED
+        else None
+    ),
+)
+
+# Files fetched up front with a single GraphQL request so the agent does not
+# need one get_file_contents round trip per file
+PREFETCH_PATHS: tuple[str, ...] = (
+    "README.md",
+    "package.json",
+    "pyproject.toml",
+    "requirements.txt",
+    "go.mod",
+    "Cargo.toml",
+)
+
+# Upper bound on characters embedded in the prompt per prefetched file
+PREFETCH_MAX_CHARS = 8000
+
+# Repository metadata fetched in the same GraphQL request as the files; this
+# replaces the separate metadata, commit and CI lookups the agent used to make
+REPO_METADATA_FIELDS = """
+description stargazerCount forkCount pushedAt
+primaryLanguage { name }
+languages(first: 10, orderBy: {field: SIZE, direction: DESC}) {
+  totalSize edges { size node { name } }
+}
+repositoryTopics(first: 10) { nodes { topic { name } } }
+workflows: object(expression: "HEAD:.github/workflows") { ... on Tree { entries { name } } }
+defaultBranchRef { target { ... on Commit {
+  history(first: 5) { nodes { committedDate messageHeadline } }
+} } }
+"""
+
+# Analysis prompt; the output shape lives in ProjectAnalysis and reaches the
+# model as the structured output tool schema, so it is not repeated here
+ANALYSIS_PROMPT_TEMPLATE = Template(
+    """Analyze the GitHub repository at ${repo_url} (owner: ${owner}, repo: ${repo}).
+
+Repository metadata, recent commits and key files may already be included
+below. Use the GitHub MCP tools (get_file_contents, list_commits, search_code)
+only for information that is still missing, and request independent lookups
+together in a single step so they run concurrently.
+
+Return the analysis as a JSON object through the structured output tool: fill
+summary, tech_stack, key_features, tags and metadata from the evidence you
+have. Use null or empty values for anything you cannot determine. DO NOT make
+up information.
+"""
+)
+
+
+class TechStackItem(BaseModel):
+    """Technology detected in the repository."""
+
+    name: str
+    category: Literal["language", "framework", "library", "tool", "aws-service"]
+    confidence: float = Field(ge=0.0, le=1.0, description="Confidence from evidence")
+
+
+class TagItem(BaseModel):
+    """Tag for categorizing the repository."""
+
+    name: str
+    category: Literal["domain", "technology", "feature", "platform"]
+    confidence: float = Field(ge=0.0, le=1.0, description="Confidence from evidence")
+
+
+class RepositoryMetadata(BaseModel):
+    """Repository facts gathered during the analysis."""
+
+    repository_owner: str
+    repository_name: str
+    primary_language: str | None = None
+    language_distribution: dict[str, float] = Field(
+        default_factory=dict, description="Language name to percentage of code"
+    )
+    star_count: int | None = None
+    fork_count: int | None = None
+    last_updated: str | None = Field(None, description="ISO 8601 timestamp")
+    has_readme: bool = False
+    has_tests: bool = Field(False, description="Repository has test files or dirs")
+    has_ci: bool = Field(False, description="Repository has .github/workflows or CI")
+
+
+class ProjectAnalysis(BaseModel):
+    """Structured analysis of a GitHub repository."""
+
+    summary: str = Field(
+        description="2-3 sentence project description from README and metadata"
+    )
+    tech_stack: list[TechStackItem] = Field(
+        description="Languages, frameworks, libraries, tools and AWS services"
+    )
+    key_features: list[str] = Field(
+        description="Features from README headings, bullet points or description"
+    )
+    tags: list[TagItem]
+    metadata: RepositoryMetadata
+    confidence_score: float = Field(
+        ge=0.0, le=1.0, description="Quality and completeness of available data"
+    )
+
+
+# In-process cache of prefetched (files, metadata) keyed by "owner/repo"
+PREFETCH_CACHE_TTL_SECONDS = 300
+PREFETCH_CACHE_MAX_ENTRIES = 512
+_prefetch_cache: dict[str, tuple[tuple[dict[str, str], dict[str, Any]], float]] = {}
+
+GITHUB_TOKEN_SECRET_NAME = "github-pat-20251020-public-repo-read-only"
+SECRETS_MANAGER_REGION = "us-west-2"
+
+# Cached GitHub token and the monotonic time it was fetched; refreshed after
+# the TTL so a rotated secret is picked up without a restart
+GITHUB_TOKEN_TTL_SECONDS = 900
+_github_token_cache: tuple[str, float] | None = None
+_github_token_lock = threading.Lock()
+
+# Reused across invocations so each refresh skips client setup
+_secrets_manager_client = boto_session.client(
+    service_name="secretsmanager", region_name=SECRETS_MANAGER_REGION
+)
+
+GITHUB_MCP_URL = "https://api.githubcopilot.com/mcp/"
+
+# Long-lived GitHub MCP session shared by all invocations: (client, tools,
+# token the session was opened with). Reopened when the token rotates.
+_mcp_session: tuple[MCPClient, list[Any], str] | None = None
+_mcp_session_lock = threading.Lock()
+
+# Errors that mean the shared MCP connection itself is broken. Anything else
+# (model throttling, output validation, prompt errors) leaves the session
+# open for the other in-flight invocations using it.
+_MCP_CONNECTION_ERRORS = (
+    McpError,
+    MCPClientInitializationError,
+    httpx.TransportError,
+    ConnectionError,
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+)
+
 
 def _get_github_token() -> str:
+    """
+    Return the GitHub token, fetching it at most once per TTL.
+
+    Returns:
+        GitHub personal access token
+
+    Raises:
+        Exception: If token cannot be retrieved from either source
+    """
+    global _github_token_cache
+
+    cached = _github_token_cache
+    if cached is not None and time.monotonic() - cached[1] < GITHUB_TOKEN_TTL_SECONDS:
+        return cached[0]
+
+    with _github_token_lock:
+        # Another thread may have refreshed the token while we waited
+        cached = _github_token_cache
+        if (
+            cached is not None
+            and time.monotonic() - cached[1] < GITHUB_TOKEN_TTL_SECONDS
+        ):
+            return cached[0]
+
+        token = _fetch_github_token()
+        _github_token_cache = (token, time.monotonic())
+        return token
+
+
+def _fetch_github_token() -> str:
     """
     Retrieve GitHub token from AWS Secrets Manager or environment variable.
 
@@ -49,20 +257,15 @@ def _get_github_token() -> str:
     Raises:
         Exception: If token cannot be retrieved from either source
     """
-    secret_name: str = "github-pat-20251020-public-repo-read-only"
-    region_name: str = "us-west-2"
+    secret_name: str = GITHUB_TOKEN_SECRET_NAME
 
     # Try AWS Secrets Manager first (production)
     # Following AWS official sample
     try:
-        # Create a Secrets Manager client
-        boto_session = session.Session()
-        client = boto_session.client(
-            service_name="secretsmanager", region_name=region_name
+        get_secret_value_response = _secrets_manager_client.get_secret_value(
+            SecretId=secret_name
         )
 
-        get_secret_value_response = client.get_secret_value(SecretId=secret_name)
-
         # Retrieve the secret string
         secret = get_secret_value_response["SecretString"]
 
@@ -106,6 +309,77 @@ def _get_github_token() -> str:
         raise
 
 
+def _get_mcp_tools(github_token: str) -> list[Any]:
+    """
+    Return GitHub MCP tools from the shared session, opening it if needed.
+
+    The session stays open across invocations so the connection setup and
+    tool discovery round trip are paid once per process (or token rotation).
+    Blocks while the session starts; call it off the event loop.
+
+    Args:
+        github_token: GitHub token to authenticate the MCP session with
+
+    Returns:
+        MCP tools bound to the open session
+    """
+    global _mcp_session
+
+    with _mcp_session_lock:
+        if _mcp_session is not None:
+            client, tools, session_token = _mcp_session
+            if session_token == github_token:
+                return tools
+            logger.info("GitHub token changed, reopening MCP session")
+            _mcp_session = None
+            client.stop(None, None, None)
+
+        client = MCPClient(
+            lambda: streamablehttp_client(
+                url=GITHUB_MCP_URL,
+                headers={"Authorization": f"Bearer {github_token}"},
+                timeout=60,
+            )
+        )
+        client.start()
+        try:
+            tools = client.list_tools_sync()
+        except Exception:
+            client.stop(None, None, None)
+            raise
+
+        _mcp_session = (client, tools, github_token)
+        return tools
+
+
+def _close_mcp_session(tools: list[Any] | None = None) -> None:
+    """
+    Close the shared GitHub MCP session; the next call reopens it.
+
+    Args:
+        tools: Tools of the session that failed; the session is left alone
+            if it has already been replaced by a newer one
+    """
+    global _mcp_session
+
+    with _mcp_session_lock:
+        if _mcp_session is None:
+            return
+        if tools is not None and _mcp_session[1] is not tools:
+            return
+        client = _mcp_session[0]
+        _mcp_session = None
+
+    try:
+        client.stop(None, None, None)
+    except Exception as e:
+        logger.warning(f"Failed to close MCP session: {e}")
+
+
+atexit.register(_close_mcp_session)
+
+
+@lru_cache(maxsize=1024)
 def _parse_github_url(repo_url: str) -> tuple[str, str]:
     """
     Parse GitHub repository URL to extract owner and repo name.
@@ -119,17 +393,189 @@ def _parse_github_url(repo_url: str) -> tuple[str, str]:
     Raises:
         ValueError: If URL format is invalid
     """
-    try:
-        parts: list[str] = repo_url.rstrip("/").split("/")
-        owner: str = parts[-2]
-        repo: str = parts[-1]
-        return owner, repo
-    except (IndexError, AttributeError) as e:
-        raise ValueError(
-            "Invalid GitHub URL format. Expected: https://github.com/owner/repo"
-        ) from e
+    if isinstance(repo_url, str):
+        url = urlsplit(repo_url.strip())
+        rest, _, repo = url.path.rstrip("/").rpartition("/")
+        prefix, _, owner = rest.rpartition("/")
+        if url.hostname in GITHUB_HOSTS and not prefix and owner and repo:
+            return owner, repo
+
+    raise ValueError(
+        "Invalid GitHub URL format. Expected: https://github.com/owner/repo"
+    )
 
 
+async def _fetch_repo_context_graphql(
+    owner: str, repo: str, paths: tuple[str, ...], github_token: str
+) -> tuple[dict[str, str], dict[str, Any]]:
+    """
+    Fetch repository files and metadata with one GitHub GraphQL request.
+
+    Each path becomes an aliased ``object(expression: "HEAD:<path>")`` field
+    next to the metadata fields, so the independent README, metadata, commit
+    and CI lookups cost one HTTP round trip and one rate-limit point.
+
+    Args:
+        owner: Repository owner
+        repo: Repository name
+        paths: File paths relative to the repository root
+        github_token: GitHub personal access token
+
+    Returns:
+        Tuple of (path to file text for every path that exists as a text
+        blob, repository metadata)
+
+    Raises:
+        httpx.HTTPError: If the request fails
+    """
+    fields = " ".join(
+        f"f{i}: object(expression: {json.dumps('HEAD:' + path)}) {{ ... on Blob {{ text }} }}"
+        for i, path in enumerate(paths)
+    )
+    query = (
+        "query($owner: String!, $name: String!) "
+        f"{{ repository(owner: $owner, name: $name) {{ {fields} {REPO_METADATA_FIELDS} }} }}"
+    )
+
+    async with httpx.AsyncClient(timeout=10) as client:
+        response = await client.post(
+            GITHUB_GRAPHQL_URL,
+            json={"query": query, "variables": {"owner": owner, "name": repo}},
+            headers={"Authorization": f"Bearer {github_token}"},
+        )
+    response.raise_for_status()
+
+    # The query already projects only the needed fields; decode the raw bytes
+    # with orjson rather than httpx's stdlib json path
+    repository = (orjson.loads(response.content).get("data") or {}).get(
+        "repository"
+    ) or {}
+    files: dict[str, str] = {}
+    for i, path in enumerate(paths):
+        blob = repository.get(f"f{i}")
+        if blob and blob.get("text") is not None:
+            files[path] = blob["text"]
+    return files, _parse_repo_metadata(repository)
+
+
+def _parse_repo_metadata(repository: dict[str, Any]) -> dict[str, Any]:
+    """
+    Flatten the GraphQL repository metadata into the analysis field names.
+
+    Args:
+        repository: ``repository`` object from the GraphQL response
+
+    Returns:
+        Repository metadata, or an empty dict if the repository was not found
+    """
+    if not repository:
+        return {}
+
+    languages = repository.get("languages") or {}
+    total_size = languages.get("totalSize") or 0
+    language_distribution = {
+        edge["node"]["name"]: round(edge["size"] * 100 / total_size, 1)
+        for edge in languages.get("edges") or ()
+        if total_size
+    }
+
+    commit = ((repository.get("defaultBranchRef") or {}).get("target")) or {}
+    recent_commits = [
+        {"date": node["committedDate"], "message": node["messageHeadline"]}
+        for node in (commit.get("history") or {}).get("nodes") or ()
+    ]
+
+    workflows = repository.get("workflows") or {}
+
+    return {
+        "description": repository.get("description"),
+        "primary_language": (repository.get("primaryLanguage") or {}).get("name"),
+        "language_distribution": language_distribution,
+        "topics": [
+            node["topic"]["name"]
+            for node in (repository.get("repositoryTopics") or {}).get("nodes") or ()
+        ],
+        "star_count": repository.get("stargazerCount"),
+        "fork_count": repository.get("forkCount"),
+        "last_updated": repository.get("pushedAt"),
+        "has_ci": bool(workflows.get("entries")),
+        "recent_commits": recent_commits,
+    }
+
+
+async def _get_prefetched_context(
+    owner: str, repo: str, github_token: str
+) -> tuple[dict[str, str], dict[str, Any]]:
+    """
+    Return prefetched repository files and metadata, reusing a recent fetch.
+
+    GraphQL requests are POSTs and cannot be revalidated with ETags, so
+    results are kept in a small TTL cache instead.
+
+    Args:
+        owner: Repository owner
+        repo: Repository name
+        github_token: GitHub personal access token
+
+    Returns:
+        Tuple of (path to file text, repository metadata)
+
+    Raises:
+        httpx.HTTPError: If the request fails
+    """
+    key = f"{owner}/{repo}"
+    now = time.monotonic()
+
+    cached = _prefetch_cache.get(key)
+    if cached is not None and now - cached[1] < PREFETCH_CACHE_TTL_SECONDS:
+        return cached[0]
+
+    context = await _fetch_repo_context_graphql(
+        owner, repo, PREFETCH_PATHS, github_token
+    )
+
+    _prefetch_cache.pop(key, None)
+    if len(_prefetch_cache) >= PREFETCH_CACHE_MAX_ENTRIES:
+        # Evict the oldest entry (dicts preserve insertion order)
+        _prefetch_cache.pop(next(iter(_prefetch_cache)))
+    _prefetch_cache[key] = (context, now)
+    return context
+
+
+def _format_prefetched_context(files: dict[str, str], metadata: dict[str, Any]) -> str:
+    """
+    Render prefetched repository metadata and files as a prompt section.
+
+    Args:
+        files: Mapping of path to file text
+        metadata: Repository metadata from the GraphQL prefetch
+
+    Returns:
+        Prompt section with the prefetched data, or an empty string if there
+        is none
+    """
+    sections: list[str] = []
+    if metadata:
+        sections.append(
+            "\nRepository metadata (already fetched, do not look it up again):\n"
+            + orjson.dumps(metadata).decode()
+            + "\n"
+        )
+    if not files:
+        return "\n".join(sections)
+
+    sections.append(
+        "\nThe following files were already fetched for you. "
+        "Do not request them again with get_file_contents:\n"
+    )
+    for path, text in files.items():
+        if len(text) > PREFETCH_MAX_CHARS:
+            text = text[:PREFETCH_MAX_CHARS] + "\n[truncated]"
+        sections.append(f"--- {path} ---\n{text}\n")
+    return "\n".join(sections)
+
+
+@lru_cache(maxsize=1024)
 def _create_analysis_prompt(owner: str, repo: str, repo_url: str) -> str:
     """
     Create the analysis prompt for the agent.
@@ -142,55 +588,9 @@ def _create_analysis_prompt(owner: str, repo: str, repo_url: str) -> str:
     Returns:
         Formatted prompt string
     """
-    return f"""Analyze the GitHub repository at {repo_url} (owner: {owner}, repo: {repo}).
-
-You have access to GitHub MCP tools. Use them to gather information:
-1. Use get_file_contents to read the README file
-2. Use search_repositories or get repository metadata to understand the project
-3. Use list_commits to see recent activity
-4. Use search_code to identify technologies and frameworks
-
-Based on the data you gather, return a JSON object with this exact structure:
-{{
-  "summary": "2-3 sentence project description based on README and repository metadata",
-  "tech_stack": [
-    {{"name": "Python", "category": "language", "confidence": 0.95}},
-    {{"name": "FastAPI", "category": "framework", "confidence": 0.90}}
-  ],
-  "key_features": ["Feature 1 from README", "Feature 2 from README", "Feature 3 from README"],
-  "tags": [
-    {{"name": "ai", "category": "domain", "confidence": 0.85}},
-    {{"name": "web-app", "category": "platform", "confidence": 0.90}}
-  ],
-  "metadata": {{
-    "repository_owner": "{owner}",
-    "repository_name": "{repo}",
-    "primary_language": "Python",
-    "language_distribution": {{"Python": 75.5, "JavaScript": 24.5}},
-    "star_count": 123,
-    "fork_count": 45,
-    "last_updated": "2025-10-17T10:00:00Z",
-    "has_readme": true,
-    "has_tests": false,
-    "has_ci": false
-  }},
-  "confidence_score": 0.92
-}}
-
-Guidelines:
-- For tech_stack, identify languages, frameworks, libraries, tools, and AWS services
-- Categories: "language", "framework", "library", "tool", "aws-service"
-- For tags, use categories: "domain", "technology", "feature", "platform"
-- Extract key_features from README headings, bullet points, or description
-- Provide realistic confidence scores (0.0 to 1.0) based on evidence
-- For has_tests, check if repository has test files or test directories
-- For has_ci, check if repository has .github/workflows or similar CI configuration
-- Overall confidence_score should reflect the quality and completeness of available data
-- If you cannot identify some information, use appropriate "null" values or empty arrays
-- DO NOT make up information
-
-Return ONLY the JSON object, no additional text or explanation.
-"""
+    return ANALYSIS_PROMPT_TEMPLATE.substitute(
+        owner=owner, repo=repo, repo_url=repo_url
+    )
 
 
 def _extract_json_from_response(raw_message: Any) -> dict[str, Any]:
@@ -211,24 +611,60 @@ def _extract_json_from_response(raw_message: Any) -> dict[str, Any]:
 
     Raises:
         json.JSONDecodeError: If JSON parsing fails
+        UnicodeDecodeError: If a bytes response is not valid UTF-8
+        TypeError: If the response is not a dict, str or bytes
     """
-    # Handle dict responses
-    if isinstance(raw_message, dict):
-        # Check for structured response with content array
-        if "content" in raw_message and isinstance(raw_message["content"], list):
-            text_content = ""
-            for item in raw_message["content"]:
-                if isinstance(item, dict) and "text" in item:
-                    text_content += item["text"]
-            return _extract_json_from_text(text_content)
-        return raw_message
+    parser = _RESPONSE_PARSERS.get(type(raw_message))
+    if parser is not None:
+        return parser(raw_message)
 
-    # Handle string responses
+    # Subclasses miss the exact-type lookup above
+    if isinstance(raw_message, dict):
+        return _extract_json_from_dict(raw_message)
     if isinstance(raw_message, str):
         return _extract_json_from_text(raw_message)
 
-    # Fallback: convert to string and parse
-    return json.loads(str(raw_message))
+    # Stringifying an arbitrary object only to fail parsing it can be costly
+    raise TypeError(f"Unsupported raw_message type: {type(raw_message)!r}")
+
+
+def _extract_json_from_dict(message: dict[str, Any]) -> dict[str, Any]:
+    """
+    Extract JSON data from a dict response.
+
+    Structured messages with a content array have their text blocks joined
+    and parsed; any other dict is assumed to be the analysis itself.
+
+    Args:
+        message: Dict response from agent
+
+    Returns:
+        Parsed JSON data as dictionary
+
+    Raises:
+        json.JSONDecodeError: If JSON parsing fails
+    """
+    # Already-parsed analysis: return as-is, no copy or re-parse
+    if "content" not in message:
+        return message
+
+    content = message["content"]
+    if not isinstance(content, list):
+        return message
+
+    # Common case: a single text block needs no joining
+    if len(content) == 1:
+        item = content[0]
+        if isinstance(item, dict) and "text" in item:
+            return _extract_json_from_text(item["text"])
+
+    texts = [
+        item["text"] for item in content if isinstance(item, dict) and "text" in item
+    ]
+
+    # Skip leading prose blocks so only text that can hold the JSON is joined
+    start = next((i for i, text in enumerate(texts) if "{" in text), 0)
+    return _extract_json_from_text("".join(texts[start:]))
 
 
 def _extract_json_from_text(text: str) -> dict[str, Any]:
@@ -236,9 +672,9 @@ def _extract_json_from_text(text: str) -> dict[str, Any]:
     Extract JSON object from text content.
 
     Tries multiple strategies:
-    1. Extract from markdown code blocks
-    2. Find JSON by counting braces
-    3. Parse entire text as JSON
+    1. Take the body of the first markdown code fence
+    2. Parse the span between the first "{" and the last "}"
+    3. Find the first JSON object with a single-pass brace scan
 
     Args:
         text: Text content potentially containing JSON
@@ -249,31 +685,113 @@ def _extract_json_from_text(text: str) -> dict[str, Any]:
     Raises:
         json.JSONDecodeError: If JSON parsing fails
     """
-    # Try to extract from markdown code blocks
-    json_match = re.search(r"```json\s*(\{.*?\})\s*```", text, re.DOTALL)
-    if json_match:
-        return json.loads(json_match.group(1))
+    content = text.strip()
+
+    # Take the body of the first code fence, even with prose around it,
+    # using plain string partitions instead of a regex pass
+    _, fence, rest = content.partition("```")
+    if fence:
+        body, _, _ = rest.partition("```")
+        # Drop the info string ("json") on the opening fence line
+        _, newline, code = body.partition("\n")
+        fenced = (code if newline else body).strip()
+        if "{" in fenced:
+            content = fenced
+
+    # Fast path: the outermost braces usually delimit the object, so try the
+    # first "{" .. last "}" slice before walking the text in Python
+    start_idx = content.find("{")
+    end_idx = content.rfind("}")
+    if start_idx != -1 and end_idx > start_idx:
+        try:
+            return orjson.loads(content[start_idx : end_idx + 1])
+        except json.JSONDecodeError:
+            pass
+
+    # Slow path: trailing prose contains braces, so count braces to find
+    # where the first object ends
+    json_str = _find_json_object(content)
+    if json_str is None:
+        # Nothing object-like found; surface the parser's own error
+        return orjson.loads(content)
+    return orjson.loads(json_str)
+
+
+def _find_json_object(text: str) -> str | None:
+    """
+    Locate the first balanced JSON object in text.
+
+    Braces inside string literals (including escaped quotes) are ignored.
+
+    Args:
+        text: Text content potentially containing JSON
 
-    # Try to find JSON by counting braces
+    Returns:
+        The JSON object substring, or None if no balanced object is found
+    """
     start_idx = text.find("{")
-    if start_idx != -1:
-        brace_count = 0
-        end_idx = start_idx
-        for i in range(start_idx, len(text)):
-            if text[i] == "{":
-                brace_count += 1
-            elif text[i] == "}":
-                brace_count -= 1
-                if brace_count == 0:
-                    end_idx = i + 1
-                    break
-
-        if end_idx > start_idx:
-            json_str = text[start_idx:end_idx]
-            return json.loads(json_str)
-
-    # Fallback: try to parse entire text
-    return json.loads(text)
+    if start_idx == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start_idx, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start_idx : i + 1]
+
+    return None
+
+
+# Exact-type dispatch for _extract_json_from_response
+_RESPONSE_PARSERS: dict[type, Callable[[Any], dict[str, Any]]] = {
+    dict: _extract_json_from_dict,
+    str: _extract_json_from_text,
+    bytes: lambda raw: _extract_json_from_text(raw.decode("utf-8")),
+}
+
+# Longest raw agent reply echoed back as a fallback summary
+_FALLBACK_SUMMARY_MAX_CHARS = 1000
+
+
+def _raw_message_text(raw_message: Any) -> str:
+    """
+    Get the text of an agent response that could not be parsed.
+
+    Only text is used: structured messages contribute their text blocks, and
+    any other object is described by its type name instead of stringified.
+
+    Args:
+        raw_message: Raw response from agent
+
+    Returns:
+        Text of the response
+    """
+    if isinstance(raw_message, str):
+        return raw_message
+    if isinstance(raw_message, bytes):
+        return raw_message.decode("utf-8", errors="replace")
+    if isinstance(raw_message, dict) and isinstance(raw_message.get("content"), list):
+        return "".join(
+            item["text"]
+            for item in raw_message["content"]
+            if isinstance(item, dict) and isinstance(item.get("text"), str)
+        )
+    return type(raw_message).__name__
 
 
 def _create_fallback_response(
@@ -285,13 +803,14 @@ def _create_fallback_response(
     Args:
         owner: Repository owner
         repo: Repository name
-        raw_message: Raw message from agent
+        raw_message: Raw message from agent, truncated to
+            _FALLBACK_SUMMARY_MAX_CHARS for the summary
 
     Returns:
         Fallback analysis dictionary
     """
     return {
-        "summary": raw_message,
+        "summary": raw_message[:_FALLBACK_SUMMARY_MAX_CHARS],
         "tech_stack": [],
         "key_features": [],
         "tags": [],
@@ -312,7 +831,7 @@ def _create_fallback_response(
 
 
 @app.entrypoint
-def analyze_project(payload: dict) -> dict:
+async def analyze_project(payload: dict) -> dict:
     """
     Main entrypoint for project analysis.
 
@@ -333,14 +852,15 @@ def analyze_project(payload: dict) -> dict:
     """
     # Generate unique request ID for tracking
     request_id: str = str(uuid.uuid4())
-    start_time: datetime = datetime.now(timezone.utc)
+    # Monotonic start for durations; wall-clock time is only logged
+    start_ns: int = time.perf_counter_ns()
 
     logger.info(
         "Analysis started",
         extra={
             "request_id": request_id,
             "payload": payload,
-            "timestamp": start_time.isoformat(),
+            "timestamp": datetime.now(UTC).isoformat(),
         },
     )
 
@@ -371,7 +891,8 @@ def analyze_project(payload: dict) -> dict:
 
         # Get GitHub token for MCP connection
         try:
-            github_token = _get_github_token()
+            # boto3 is blocking; keep the Secrets Manager call off the event loop
+            github_token = await asyncio.to_thread(_get_github_token)
         except Exception as token_error:
             error_msg = f"Failed to get GitHub token: {str(token_error)}"
             logger.error(error_msg, extra={"request_id": request_id})
@@ -381,49 +902,67 @@ def analyze_project(payload: dict) -> dict:
                 "status": "failed",
             }
 
-        # Create MCP client for GitHub
-        github_mcp_client = MCPClient(
-            lambda: streamablehttp_client(
-                url="https://api.githubcopilot.com/mcp/",
-                headers={"Authorization": f"Bearer {github_token}"},
-                timeout=60,
+        # Prefetch common files in one request; the agent falls back to MCP
+        # tools for anything missing
+        try:
+            prefetched_files, repo_metadata = await _get_prefetched_context(
+                owner, repo, github_token
             )
-        )
+            logger.info(
+                f"Prefetched metadata and {len(prefetched_files)} files via GitHub GraphQL",
+                extra={"request_id": request_id},
+            )
+        except Exception as prefetch_error:
+            logger.warning(
+                "Failed to prefetch repository context",
+                extra={"request_id": request_id, "error": str(prefetch_error)},
+            )
+            prefetched_files, repo_metadata = {}, {}
 
-        # Use MCP client within context manager (REQUIRED by Strands)
+        # The MCP session must be open for the whole agent run (REQUIRED by
+        # Strands); it is shared across invocations and opened on first use.
+        # Opening blocks while the session thread spins up, so it runs in a
+        # worker thread instead of on the event loop.
+        tools = None
         try:
-            with github_mcp_client:
-                # Get tools from MCP server
-                logger.info(
-                    "Connecting to GitHub MCP server",
-                    extra={"request_id": request_id},
-                )
-                tools = github_mcp_client.list_tools_sync()
-                logger.info(
-                    f"Loaded {len(tools)} tools from GitHub MCP server",
-                    extra={"request_id": request_id},
-                )
-
-                # Create agent with MCP tools
-                agent = Agent(model="us.amazon.nova-micro-v1:0", tools=tools)
-
-                # Create analysis prompt
-                prompt = _create_analysis_prompt(owner, repo, repo_url)
-
-                logger.info(
-                    "Invoking agent with GitHub MCP tools",
-                    extra={"request_id": request_id, "repository": f"{owner}/{repo}"},
-                )
-
-                # Invoke agent (must be within the context manager)
-                result = agent(prompt)
-
-                logger.info(
-                    "Agent invocation completed",
-                    extra={"request_id": request_id, "repository": f"{owner}/{repo}"},
-                )
+            logger.info(
+                "Connecting to GitHub MCP server",
+                extra={"request_id": request_id},
+            )
+            tools = await asyncio.to_thread(_get_mcp_tools, github_token)
+            logger.info(
+                f"Loaded {len(tools)} tools from GitHub MCP server",
+                extra={"request_id": request_id},
+            )
+
+            # Agents keep conversation history, so each invocation gets its own
+            agent = Agent(model=bedrock_model, tools=tools)
+
+            # Create analysis prompt
+            prompt = _create_analysis_prompt(
+                owner, repo, repo_url
+            ) + _format_prefetched_context(prefetched_files, repo_metadata)
+
+            logger.info(
+                "Invoking agent with GitHub MCP tools",
+                extra={"request_id": request_id, "repository": f"{owner}/{repo}"},
+            )
+
+            # Invoke agent (must be while the MCP session is open); the model
+            # returns the analysis through the ProjectAnalysis output tool
+            result = await agent.invoke_async(
+                prompt, structured_output_model=ProjectAnalysis
+            )
+
+            logger.info(
+                "Agent invocation completed",
+                extra={"request_id": request_id, "repository": f"{owner}/{repo}"},
+            )
 
         except Exception as mcp_error:
+            # Drop a broken shared session so the next invocation reconnects
+            if isinstance(mcp_error, _MCP_CONNECTION_ERRORS):
+                await asyncio.to_thread(_close_mcp_session, tools)
             error_msg = f"MCP operation failed: {str(mcp_error)}"
             logger.error(
                 error_msg,
@@ -442,11 +981,13 @@ def analyze_project(payload: dict) -> dict:
 
         # Parse response
         try:
-            analysis_data = _extract_json_from_response(result.message)
+            if result.structured_output is not None:
+                analysis_data = result.structured_output.model_dump()
+            else:
+                analysis_data = _extract_json_from_response(result.message)
 
             # Calculate processing duration
-            end_time = datetime.now(timezone.utc)
-            duration_ms = int((end_time - start_time).total_seconds() * 1000)
+            duration_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
 
             logger.info(
                 "Analysis completed successfully",
@@ -466,9 +1007,15 @@ def analyze_project(payload: dict) -> dict:
                 "processing_time_ms": duration_ms,
             }
 
-        except (json.JSONDecodeError, AttributeError, KeyError) as json_error:
+        except (
+            json.JSONDecodeError,
+            UnicodeDecodeError,
+            AttributeError,
+            KeyError,
+            TypeError,
+        ) as json_error:
             # If JSON parsing fails, return fallback response
-            raw_message = str(result.message)
+            raw_message = _raw_message_text(result.message)
 
             logger.warning(
                 "Failed to parse agent response as JSON",
@@ -480,8 +1027,7 @@ def analyze_project(payload: dict) -> dict:
             )
 
             # Calculate processing duration
-            end_time = datetime.now(timezone.utc)
-            duration_ms = int((end_time - start_time).total_seconds() * 1000)
+            duration_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
 
             return {
                 "request_id": request_id,
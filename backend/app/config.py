@@ -1,9 +1,12 @@
 """Configuration management for the agent orchestration service."""
 
-import os
+import threading
+import time
+from typing import Annotated, Any
 
 import boto3
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic import Field, PrivateAttr, field_validator
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
 
 
 class Settings(BaseSettings):
@@ -24,36 +27,85 @@ class Settings(BaseSettings):
 
     # GitHub Configuration
     github_token_param_name: str = "/hackagallery/github-token"
-    _github_token = None
+    github_token_ttl_seconds: int = 900
+    # Hourly GitHub request budget per token, shared across workers via Redis
+    # (when redis_url is set)
+    github_requests_per_hour: int = 5000
+    # SQLite file that keeps repository lookups across restarts; unset keeps
+    # them in memory only
+    github_cache_path: str | None = None
+    _github_token: str | None = PrivateAttr(default=None)
+    _github_token_fetched_at: float = PrivateAttr(default=0.0)
+    _github_token_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _ssm_client: Any = PrivateAttr(default=None)
 
     # API Configuration
     api_timeout_seconds: int = 120
     cache_ttl_seconds: int = 3600
+    cache_max_entries: int = 1024
+    # Redis URL for a cache shared across workers (requires the redis
+    # package); the per-process in-memory cache is used when unset
+    redis_url: str | None = None
+    batch_max_concurrency: int = 5
+    # Max concurrent agent invocations across all running workflows
+    workflow_max_concurrency: int = 10
+    # Max pooled connections to AgentCore; size for concurrent invocations
+    agent_pool_size: int = 64
+    # Minimum response size in bytes to gzip; unset disables compression
+    gzip_min_size: int | None = None
+
+    # CORS origins for CORSMiddleware, comma-separated in the environment.
+    # Leave empty when the Lambda Function URL handles CORS.
+    allowed_origins: Annotated[list[str], NoDecode] = Field(default_factory=list)
 
     # Logging
     log_level: str = "INFO"
 
+    @field_validator("allowed_origins", mode="before")
+    @classmethod
+    def _split_allowed_origins(cls, value: object) -> object:
+        """Parse a comma-separated origin list from the environment."""
+        if isinstance(value, str):
+            return [origin.strip() for origin in value.split(",") if origin.strip()]
+        return value
+
     @property
     def github_token(self) -> str:
-        """Get GitHub token from Parameter Store, with caching."""
-        if self._github_token is None:
-            try:
-                # Get the parameter name from environment variable
-                param_name = os.getenv("GITHUB_TOKEN_PARAM_NAME", self.github_token_param_name)
-
-                # Create SSM client
-                ssm = boto3.client("ssm", region_name=self.aws_region)
+        """Get GitHub token from Parameter Store, cached for github_token_ttl_seconds."""
+        if self._github_token is not None and not self._github_token_expired():
+            return self._github_token
 
-                # Fetch the parameter
-                response = ssm.get_parameter(Name=param_name, WithDecryption=True)
-
-                self._github_token = response["Parameter"]["Value"]
-            except Exception as e:
-                # Fallback to placeholder if parameter fetch fails
-                print(f"Warning: Could not fetch GitHub token from Parameter Store: {e}")
-                self._github_token = "github_pat_XXXXXXXXXXXXXXXXXXXXXXXXXXXX"
+        with self._github_token_lock:
+            # Another thread may have refreshed the token while we waited
+            if self._github_token is None or self._github_token_expired():
+                self._github_token = self._fetch_github_token()
+                self._github_token_fetched_at = time.monotonic()
 
         return self._github_token
 
+    def _github_token_expired(self) -> bool:
+        """Check whether the cached GitHub token is older than its TTL."""
+        return time.monotonic() - self._github_token_fetched_at >= self.github_token_ttl_seconds
+
+    def _fetch_github_token(self) -> str:
+        """Fetch GitHub token from Parameter Store, or a placeholder on failure."""
+        try:
+            # Create the SSM client once; refreshes after the TTL reuse it.
+            # Only called under _github_token_lock.
+            if self._ssm_client is None:
+                self._ssm_client = boto3.client("ssm", region_name=self.aws_region)
+
+            # GITHUB_TOKEN_PARAM_NAME is read into github_token_param_name by
+            # pydantic-settings
+            response = self._ssm_client.get_parameter(
+                Name=self.github_token_param_name, WithDecryption=True
+            )
+
+            return response["Parameter"]["Value"]
+        except Exception as e:
+            # Fallback to placeholder if parameter fetch fails
+            print(f"Warning: Could not fetch GitHub token from Parameter Store: {e}")
+            return "github_pat_XXXXXXXXXXXXXXXXXXXXXXXXXXXX"
+
 
 settings = Settings()
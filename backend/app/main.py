@@ -3,6 +3,9 @@
 import logging
 
 from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.config import settings
 from app.routers import projects, workflows
@@ -18,13 +21,28 @@ app = FastAPI(
     title="Project Intelligence Agent Orchestration",
     description="Multi-agent orchestration service for project analysis",
     version="0.1.0",
+    default_response_class=ORJSONResponse,
 )
 
 # Add global exception handler
 app.add_exception_handler(Exception, global_exception_handler)
 
-# Note: CORS is handled by Lambda Function URL configuration in SAM template
-# Do not add CORSMiddleware here as it will cause duplicate CORS headers
+# Note: CORS is handled by Lambda Function URL configuration in SAM template.
+# CORSMiddleware is only added when ALLOWED_ORIGINS is set (e.g. running
+# locally); enabling both would cause duplicate CORS headers.
+if settings.allowed_origins:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.allowed_origins,
+        allow_methods=["GET", "POST"],
+        allow_headers=["*"],
+        max_age=300,
+    )
+
+# Compress JSON bodies of at least GZIP_MIN_SIZE bytes for clients that
+# accept gzip; off unless configured
+if settings.gzip_min_size is not None:
+    app.add_middleware(GZipMiddleware, minimum_size=settings.gzip_min_size)
 
 # Include routers
 app.include_router(projects.router)
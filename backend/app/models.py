@@ -16,6 +16,17 @@ class AnalyzeProjectRequest(BaseModel):
     )
 
 
+class BatchAnalyzeProjectRequest(BaseModel):
+    """Request to analyze several GitHub projects at once."""
+
+    repositories: list[AnalyzeProjectRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=20,
+        description="Projects to analyze",
+    )
+
+
 # Response Models
 class TechnologyItem(BaseModel):
     """Technology detected in the project."""
@@ -51,6 +62,23 @@ class ProjectAnalysis(BaseModel):
     metadata: AnalysisMetadata
 
 
+class AgentAnalysis(BaseModel):
+    """Analysis section produced by the Project Intelligence Agent."""
+
+    summary: str = ""
+    tech_stack: list[TechnologyItem] = Field(default_factory=list)
+    tags: list[TagItem] = Field(default_factory=list)
+    key_features: list[str] = Field(default_factory=list)
+
+
+class AgentAnalysisResult(BaseModel):
+    """Response envelope returned by the Project Intelligence Agent."""
+
+    request_id: str | None = None
+    status: str | None = None
+    analysis: AgentAnalysis = Field(default_factory=AgentAnalysis)
+
+
 class ErrorDetail(BaseModel):
     """Detailed error information for API responses."""
 
@@ -77,6 +105,21 @@ class AnalysisResponse(BaseModel):
     request_id: str = Field(..., description="Unique request identifier")
 
 
+class BatchAnalysisResponse(BaseModel):
+    """API response for a batch of project analyses."""
+
+    success: bool = Field(..., description="True if every project was analyzed")
+    results: list[AnalysisResponse] = Field(..., description="Results in request order")
+    request_id: str = Field(..., description="Unique request identifier")
+
+
+class CacheStatusResponse(BaseModel):
+    """Whether an analysis of a repository's current state is cached."""
+
+    repository_url: str
+    cached: bool
+
+
 # Orchestration Models (for future multi-agent workflows)
 class AgentTask(BaseModel):
     """A task to be executed by an agent."""
@@ -84,6 +127,8 @@ class AgentTask(BaseModel):
     agent_name: str
     input_data: dict[str, Any]
     depends_on: list[str] = Field(default_factory=list)
+    # Reuse a cached response for identical input; only for idempotent agents
+    cache: bool = False
 
 
 class WorkflowRequest(BaseModel):
@@ -101,3 +146,16 @@ class WorkflowResponse(BaseModel):
     execution_order: list[str]
     total_time_ms: int
     error: str | None = None
+
+
+class BatchWorkflowRequest(BaseModel):
+    """Request to execute several multi-agent workflows at once."""
+
+    workflows: list[WorkflowRequest] = Field(..., min_length=1, max_length=20)
+
+
+class BatchWorkflowResponse(BaseModel):
+    """Response from a batch of multi-agent workflows."""
+
+    success: bool
+    results: list[WorkflowResponse]
@@ -1,24 +1,37 @@
 """Project analysis endpoints."""
 
+import asyncio
 import logging
 import time
 import uuid
 from datetime import UTC, datetime
 
 from fastapi import APIRouter, HTTPException
+from pydantic import HttpUrl
 
-from app.models import AnalysisMetadata, AnalysisResponse, AnalyzeProjectRequest, ProjectAnalysis
+from app.config import settings
+from app.models import (
+    AgentAnalysisResult,
+    AnalysisMetadata,
+    AnalysisResponse,
+    AnalyzeProjectRequest,
+    BatchAnalysisResponse,
+    BatchAnalyzeProjectRequest,
+    CacheStatusResponse,
+    ErrorDetail,
+    ProjectAnalysis,
+)
 from app.services.agent_client import AgentCoreClient, AgentRegistry
 from app.services.cache import cache
 from app.services.error_handler import ErrorHandler
-from app.services.github_validator import get_github_validator
+from app.services.github_validator import RepositoryLookup, get_github_validator
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/projects", tags=["projects"])
 
 
 @router.post("/analyze", response_model=AnalysisResponse)
-async def analyze_project(request: AnalyzeProjectRequest) -> AnalysisResponse | None:
+async def analyze_project(request: AnalyzeProjectRequest) -> AnalysisResponse:
     """
     Analyze a GitHub project using the Project Intelligence Agent.
 
@@ -29,9 +42,127 @@ async def analyze_project(request: AnalyzeProjectRequest) -> AnalysisResponse |
     4. Returns structured analysis results
     """
     request_id = str(uuid.uuid4())
-    repo_url = str(request.repository_url)
+    analysis = await _analyze_one(request_id, str(request.repository_url), AgentCoreClient())
+    return AnalysisResponse(success=True, data=analysis, request_id=request_id)
 
-    logger.info(f"[{request_id}] Analyzing project: {repo_url}")
+
+@router.post("/analyze_batch", response_model=BatchAnalysisResponse)
+async def analyze_project_batch(request: BatchAnalyzeProjectRequest) -> BatchAnalysisResponse:
+    """
+    Analyze several GitHub projects concurrently.
+
+    Each project goes through the same validation, cache and agent steps as
+    /analyze. Up to settings.batch_max_concurrency projects run at once over
+    a shared agent client. A failing project is reported in its own result
+    instead of failing the whole batch.
+    """
+    request_id = str(uuid.uuid4())
+    client = AgentCoreClient()
+    semaphore = asyncio.Semaphore(settings.batch_max_concurrency)
+
+    logger.info("[%s] Analyzing batch of %s projects", request_id, len(request.repositories))
+
+    # Check every repository's existence and head commit in one batched
+    # lookup up front, instead of GitHub requests per project
+    validator = get_github_validator()
+    validations = validator.validate_urls(str(item.repository_url) for item in request.repositories)
+    repositories = [(v.owner, v.repo) for v in validations if v.is_valid and v.owner and v.repo]
+    existence = asyncio.create_task(validator.check_repositories_exist(repositories))
+
+    async def analyze(item: AnalyzeProjectRequest) -> AnalysisResponse:
+        item_request_id = str(uuid.uuid4())
+        async with semaphore:
+            try:
+                analysis = await _analyze_one(
+                    item_request_id, str(item.repository_url), client, existence
+                )
+            except HTTPException as e:
+                # ErrorHandler details are StandardErrorResponse dumps
+                return AnalysisResponse(
+                    success=False,
+                    error=ErrorDetail.model_validate(e.detail["error"]),
+                    request_id=item_request_id,
+                )
+        return AnalysisResponse(success=True, data=analysis, request_id=item_request_id)
+
+    try:
+        results = await asyncio.gather(*(analyze(item) for item in request.repositories))
+    finally:
+        # Only still running if every project failed before waiting for it
+        existence.cancel()
+        await asyncio.gather(existence, return_exceptions=True)
+
+    return BatchAnalysisResponse(
+        success=all(result.success for result in results),
+        results=results,
+        request_id=request_id,
+    )
+
+
+@router.get("/cache-status", response_model=CacheStatusResponse)
+async def get_cache_status(repository_url: HttpUrl) -> CacheStatusResponse:
+    """
+    Report whether an analysis of the repository's current state is cached.
+
+    Resolves the same cache key as /analyze without invoking the agent, so
+    callers can check for a cached analysis cheaply.
+    """
+    repo_url = str(repository_url)
+    validation_result = get_github_validator().validate_url(repo_url)
+
+    if not validation_result.is_valid:
+        ErrorHandler.handle_github_url_error(
+            str(uuid.uuid4()), validation_result.error_message or "Invalid GitHub URL"
+        )
+
+    cache_key = await _cache_key(
+        validation_result.owner or "", validation_result.repo or "", repo_url
+    )
+    cached = await cache.get(cache_key) is not None
+    return CacheStatusResponse(repository_url=repo_url, cached=cached)
+
+
+async def _cache_key(
+    owner: str, repo: str, repo_url: str, lookup: RepositoryLookup | None = None
+) -> str:
+    """
+    Build the analysis cache key for a repository.
+
+    The head commit SHA versions the key, so a repository is only
+    re-analyzed once it changes. The SHA is reused for a short TTL, so
+    repeated lookups make no GitHub request; falls back to the URL if the
+    SHA cannot be determined. A batched lookup result supplies the SHA
+    without any request.
+    """
+    if lookup is not None:
+        head_sha = lookup.head_sha
+    else:
+        head_sha = await get_github_validator().get_head_sha(owner, repo)
+    return f"{owner}/{repo}@{head_sha}" if head_sha else repo_url
+
+
+async def _analyze_one(
+    request_id: str,
+    repo_url: str,
+    client: AgentCoreClient,
+    existence: asyncio.Task[dict[tuple[str, str], RepositoryLookup]] | None = None,
+) -> ProjectAnalysis:
+    """
+    Validate, look up or analyze a single project.
+
+    Args:
+        request_id: Unique request identifier
+        repo_url: GitHub repository URL
+        client: Agent client used for the invocation
+        existence: Optional batched repository lookup shared by a batch
+
+    Returns:
+        ProjectAnalysis from the cache or a fresh agent run
+
+    Raises:
+        HTTPException: Structured error from ErrorHandler
+    """
+    logger.info("[%s] Analyzing project: %s", request_id, repo_url)
 
     # Enhanced GitHub URL validation
     validator = get_github_validator()
@@ -42,47 +173,55 @@ async def analyze_project(request: AnalyzeProjectRequest) -> AnalysisResponse |
             request_id, validation_result.error_message or "Invalid GitHub URL"
         )
 
-    # Check repository accessibility
-    try:
-        repo_exists = await validator.check_repository_exists(
-            validation_result.owner or "", validation_result.repo or ""
-        )
-        if not repo_exists:
-            ErrorHandler.handle_repository_not_found(request_id, repo_url)
-    except HTTPException:
-        # Re-raise HTTPExceptions from ErrorHandler (repository not found, rate limit, etc.)
-        raise
-    except Exception as e:
-        if "rate limit" in str(e).lower():
-            ErrorHandler.handle_rate_limit_error(request_id)
-        else:
-            # Log the error and re-raise as internal error
-            logger.error(f"[{request_id}] Repository accessibility check failed: {e}")
-            ErrorHandler.handle_internal_error(request_id, e)
+    owner = validation_result.owner or ""
+    repo = validation_result.repo or ""
 
-    # Check cache
-    cached_result = cache.get(repo_url)
+    lookup = await _batched_lookup(request_id, owner, repo, existence)
+    cache_key = await _cache_key(owner, repo, repo_url, lookup)
+
+    # Check cache before any other GitHub round trip
+    cached_result = await cache.get(cache_key)
     if cached_result:
-        logger.info(f"[{request_id}] Returning cached result")
-        return AnalysisResponse(success=True, data=cached_result, request_id=request_id)
+        logger.info("[%s] Returning cached result", request_id)
+        # Redis hands back the model as a dict
+        return ProjectAnalysis.model_validate(cached_result)
 
     try:
         start_time = time.time()
 
-        # Get agent client
-        client = AgentCoreClient()
         agent_arn = AgentRegistry.get_agent_arn("project_intelligence")
 
         # Prepare payload
         payload = {"repository_url": repo_url, "request_id": request_id}
 
-        # Invoke agent with timeout handling
-        try:
-            result = await client.invoke_agent(
+        # When the repository is already known to exist, start the agent
+        # right away and confirm accessibility while it runs. Otherwise check
+        # first: cancelling the task does not stop an invocation already
+        # running in the executor, so a failed check would waste an agent call.
+        # Batched lookup results are recorded by the validator too.
+        speculative = validator.known_to_exist(owner, repo)
+        if not speculative:
+            await _check_repository_access(request_id, repo_url, owner, repo, lookup)
+
+        agent_task = asyncio.create_task(
+            client.invoke_agent(
                 agent_arn,
                 payload,
                 timeout_seconds=25,  # 25-second timeout as per requirements
+                response_model=AgentAnalysisResult,
             )
+        )
+        if speculative:
+            try:
+                await _check_repository_access(request_id, repo_url, owner, repo, lookup)
+            except BaseException:
+                agent_task.cancel()
+                await asyncio.wait([agent_task])
+                raise
+
+        # Wait for the agent with timeout handling
+        try:
+            result = await agent_task
         except TimeoutError:
             ErrorHandler.handle_agent_timeout(request_id, 25)
         except Exception as agent_error:
@@ -90,19 +229,16 @@ async def analyze_project(request: AnalyzeProjectRequest) -> AnalysisResponse |
 
         elapsed_ms = int((time.time() - start_time) * 1000)
 
-        # Extract analysis data from agent response
         # Agent returns: {"request_id": "...", "status": "...", "analysis": {...}}
-        analysis_data = result.get("analysis", {})
-
-        # Map agent's tech_stack to backend's technologies
-        tech_stack = analysis_data.get("tech_stack", [])
+        # already decoded and validated into AgentAnalysisResult
+        analysis_data = result.analysis
 
         # Build response
         analysis = ProjectAnalysis(
-            summary=analysis_data.get("summary", ""),
-            technologies=tech_stack,  # Map tech_stack to technologies
-            tags=analysis_data.get("tags", []),
-            key_features=analysis_data.get("key_features", []),
+            summary=analysis_data.summary,
+            technologies=analysis_data.tech_stack,  # Map tech_stack to technologies
+            tags=analysis_data.tags,
+            key_features=analysis_data.key_features,
             metadata=AnalysisMetadata(
                 request_id=request_id,
                 agent_name="project_intelligence",
@@ -112,11 +248,11 @@ async def analyze_project(request: AnalyzeProjectRequest) -> AnalysisResponse |
         )
 
         # Cache result
-        cache.set(repo_url, analysis)
+        await cache.set(cache_key, analysis)
 
-        logger.info(f"[{request_id}] Analysis completed in {elapsed_ms}ms")
+        logger.info("[%s] Analysis completed in %sms", request_id, elapsed_ms)
 
-        return AnalysisResponse(success=True, data=analysis, request_id=request_id)
+        return analysis
 
     except HTTPException:
         # Re-raise HTTPExceptions (already handled by ErrorHandler)
@@ -124,3 +260,75 @@ async def analyze_project(request: AnalyzeProjectRequest) -> AnalysisResponse |
     except Exception as e:
         # Handle any unexpected errors
         ErrorHandler.handle_internal_error(request_id, e)
+
+
+async def _batched_lookup(
+    request_id: str,
+    owner: str,
+    repo: str,
+    existence: asyncio.Task[dict[tuple[str, str], RepositoryLookup]] | None = None,
+) -> RepositoryLookup | None:
+    """
+    Get a repository's result from a batch's shared lookup.
+
+    Args:
+        request_id: Unique request identifier
+        owner: Repository owner
+        repo: Repository name
+        existence: Optional batched lookup shared by a batch
+
+    Returns:
+        The lookup result, or None if there is no batched lookup, it failed
+        or it did not resolve the repository
+    """
+    if existence is None:
+        return None
+    try:
+        # Shielded so one cancelled project does not cancel the shared lookup
+        return (await asyncio.shield(existence)).get((owner, repo))
+    except Exception as e:
+        logger.warning(
+            "[%s] Batched repository lookup failed, checking individually: %s", request_id, e
+        )
+        return None
+
+
+async def _check_repository_access(
+    request_id: str,
+    repo_url: str,
+    owner: str,
+    repo: str,
+    lookup: RepositoryLookup | None = None,
+) -> None:
+    """
+    Check that a repository exists and is accessible.
+
+    Args:
+        request_id: Unique request identifier
+        repo_url: GitHub repository URL
+        owner: Repository owner
+        repo: Repository name
+        lookup: Optional batched lookup result; without one the repository
+            is checked individually
+
+    Raises:
+        HTTPException: Structured error if the repository is missing, rate
+            limited or the check fails
+    """
+    try:
+        if lookup is not None:
+            repo_exists = lookup.exists
+        else:
+            repo_exists = await get_github_validator().check_repository_exists(owner, repo)
+        if not repo_exists:
+            ErrorHandler.handle_repository_not_found(request_id, repo_url)
+    except HTTPException:
+        # Re-raise HTTPExceptions from ErrorHandler (repository not found, rate limit, etc.)
+        raise
+    except Exception as e:
+        if "rate limit" in str(e).lower():
+            ErrorHandler.handle_rate_limit_error(request_id)
+        else:
+            # Log the error and re-raise as internal error
+            logger.error("[%s] Repository accessibility check failed: %s", request_id, e)
+            ErrorHandler.handle_internal_error(request_id, e)
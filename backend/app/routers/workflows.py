@@ -1,19 +1,29 @@
 """Multi-agent workflow endpoints (future expansion)."""
 
+import asyncio
 import logging
-import uuid
+from secrets import token_hex
+from typing import Any
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 
-from app.models import WorkflowRequest, WorkflowResponse
-from app.services.orchestrator import AgentOrchestrator
+from app.config import settings
+from app.models import (
+    BatchWorkflowRequest,
+    BatchWorkflowResponse,
+    WorkflowRequest,
+    WorkflowResponse,
+)
+from app.services.orchestrator import AgentOrchestrator, get_orchestrator
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/workflows", tags=["workflows"])
 
 
 @router.post("/execute", response_model=WorkflowResponse)
-async def execute_workflow(request: WorkflowRequest) -> WorkflowResponse:
+async def execute_workflow(
+    request: WorkflowRequest, orchestrator: AgentOrchestrator = Depends(get_orchestrator)
+) -> WorkflowResponse:
     """
     Execute a multi-agent workflow.
 
@@ -38,33 +48,81 @@ async def execute_workflow(request: WorkflowRequest) -> WorkflowResponse:
         ]
     }
     """
-    request_id = str(uuid.uuid4())
+    request_id = token_hex(16)
 
     logger.info(
-        f"[{request_id}] Executing {request.workflow_type} workflow with {len(request.tasks)} tasks"
+        "[%s] Executing %s workflow with %s tasks",
+        request_id,
+        request.workflow_type,
+        len(request.tasks),
     )
 
     try:
-        orchestrator = AgentOrchestrator()
         result = await orchestrator.execute_workflow(request)
 
-        logger.info(f"[{request_id}] Workflow completed in {result['total_time_ms']}ms")
+        logger.info("[%s] Workflow completed in %sms", request_id, result["total_time_ms"])
 
-        return WorkflowResponse(
-            success=True,
-            results=result["results"],
-            execution_order=result["execution_order"],
-            total_time_ms=result["total_time_ms"],
-        )
+        return _to_workflow_response(result)
 
     except Exception as e:
-        logger.error(f"[{request_id}] Workflow execution failed: {e}")
+        logger.error("[%s] Workflow execution failed: %s", request_id, e)
         raise HTTPException(status_code=500, detail=f"Workflow execution failed: {str(e)}")
 
 
+@router.post("/batch", response_model=BatchWorkflowResponse)
+async def execute_workflow_batch(
+    request: BatchWorkflowRequest, orchestrator: AgentOrchestrator = Depends(get_orchestrator)
+) -> BatchWorkflowResponse:
+    """
+    Execute several multi-agent workflows concurrently.
+
+    All workflows share the orchestrator and agent client, and up to
+    settings.batch_max_concurrency run at once. A failing workflow is
+    reported in its own result instead of failing the whole batch.
+    """
+    request_id = token_hex(16)
+    semaphore = asyncio.Semaphore(settings.batch_max_concurrency)
+
+    logger.info("[%s] Executing batch of %s workflows", request_id, len(request.workflows))
+
+    async def execute(workflow: WorkflowRequest) -> WorkflowResponse:
+        async with semaphore:
+            try:
+                result = await orchestrator.execute_workflow(workflow)
+            except Exception as e:
+                logger.error("[%s] Workflow execution failed: %s", request_id, e)
+                return WorkflowResponse(
+                    success=False,
+                    results={},
+                    execution_order=[],
+                    total_time_ms=0,
+                    error=f"Workflow execution failed: {str(e)}",
+                )
+        return _to_workflow_response(result)
+
+    results = await asyncio.gather(*(execute(workflow) for workflow in request.workflows))
+
+    return BatchWorkflowResponse(
+        success=all(result.success for result in results),
+        results=results,
+    )
+
+
 @router.get("/agents")
 async def list_agents() -> dict[str, list[str]]:
     """List all available agents."""
     from app.services.agent_client import AgentRegistry
 
     return {"agents": AgentRegistry.list_agents()}
+
+
+def _to_workflow_response(result: dict[str, Any]) -> WorkflowResponse:
+    """Build the API response from an AgentOrchestrator.execute_workflow result."""
+    errors = result["errors"]
+    return WorkflowResponse(
+        success=not errors,
+        results=result["results"],
+        execution_order=result["execution_order"],
+        total_time_ms=result["total_time_ms"],
+        error="; ".join(f"{name}: {message}" for name, message in errors.items()) or None,
+    )
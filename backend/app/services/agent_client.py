@@ -1,23 +1,69 @@
 """Client for invoking Bedrock AgentCore agents."""
 
-import json
+import asyncio
+import hashlib
 import logging
 import time
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from secrets import token_hex
+from types import MappingProxyType
+from typing import Any, TypeVar
 
 import boto3
+import orjson
+from botocore.config import Config
 from botocore.exceptions import ClientError
+from pydantic import BaseModel, ValidationError
 
 from app.config import settings
+from app.services.cache import cache
 
 logger = logging.getLogger(__name__)
 
+ResponseModelT = TypeVar("ResponseModelT", bound=BaseModel)
+
+# boto3 calls block, so invocations run here instead of on the event loop;
+# sized like the connection pool so every worker can hold a connection
+_invoke_executor = ThreadPoolExecutor(
+    max_workers=settings.agent_pool_size, thread_name_prefix="agentcore-invoke"
+)
+
+# Agent response statuses that may be served from the cache
+_SUCCESS_STATUSES = frozenset({"completed", "success"})
+
+
+@lru_cache(maxsize=1)
+def get_agentcore_client() -> Any:
+    """
+    Get or create the shared bedrock-agentcore boto3 client.
+
+    Creating a boto3 client loads and parses the service model, so it is done
+    once per process on first use instead of per AgentCoreClient. boto3
+    clients are thread-safe. The connection pool is sized by
+    settings.agent_pool_size so parallel workflows reuse open connections
+    instead of paying a new TLS handshake per call.
+
+    Returns:
+        bedrock-agentcore boto3 client
+    """
+    return boto3.client(
+        "bedrock-agentcore",
+        region_name=settings.aws_region,
+        config=Config(
+            max_pool_connections=settings.agent_pool_size,
+            tcp_keepalive=True,
+            connect_timeout=5,
+            read_timeout=settings.api_timeout_seconds,
+        ),
+    )
+
 
 class AgentCoreClient:
     """Client for invoking agents on Bedrock AgentCore Runtime."""
 
     def __init__(self):
-        self.client = boto3.client("bedrock-agentcore", region_name=settings.aws_region)
+        self.client = get_agentcore_client()
 
     async def invoke_agent(
         self,
@@ -26,7 +72,9 @@ class AgentCoreClient:
         session_id: str | None = None,
         qualifier: str = "DEFAULT",
         timeout_seconds: int = 30,
-    ) -> dict[str, Any]:
+        response_model: type[ResponseModelT] | None = None,
+        use_cache: bool = False,
+    ) -> dict[str, Any] | ResponseModelT:
         """
         Invoke an agent and return the response with timeout handling.
 
@@ -36,70 +84,131 @@ class AgentCoreClient:
             session_id: Optional session ID (generated if not provided)
             qualifier: Agent version qualifier
             timeout_seconds: Maximum time to wait for response
+            response_model: Optional model to decode and validate the raw
+                response into in a single pass
+            use_cache: Reuse a cached response for an identical agent,
+                payload and caller-supplied session instead of invoking the
+                agent again. Only successful responses are cached.
 
         Returns:
-            Parsed response from the agent
+            Parsed response from the agent (a dict, or an instance of
+            response_model when given)
 
         Raises:
             TimeoutError: If invocation exceeds timeout
             Exception: If invocation fails
         """
+        # A generated session ID is random, so only a caller-supplied one
+        # can distinguish otherwise identical cached invocations
+        cache_session = session_id or ""
         if not session_id:
             session_id = self._generate_session_id()
 
         start_time = time.time()
 
         try:
-            logger.info(f"Invoking agent: {agent_arn} (timeout: {timeout_seconds}s)")
+            logger.info("Invoking agent: %s (timeout: %ss)", agent_arn, timeout_seconds)
 
-            # Encode payload
-            payload_bytes = json.dumps(payload).encode("utf-8")
+            # Encode payload; sorted keys give equal payloads equal bytes
+            payload_bytes = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
 
-            # Invoke agent with timeout
-            response = self.client.invoke_agent_runtime(
-                runtimeSessionId=session_id,
-                agentRuntimeArn=agent_arn,
-                qualifier=qualifier,
-                payload=payload_bytes,
+            # The raw body is cached so each caller decodes its own copy
+            cache_key = (
+                f"agent:{agent_arn}:{qualifier}:{cache_session}:"
+                f"{hashlib.blake2b(payload_bytes, digest_size=16).hexdigest()}"
             )
-
-            # Check if operation exceeded timeout
-            elapsed_time = time.time() - start_time
-            if elapsed_time > timeout_seconds:
-                raise TimeoutError(f"Agent invocation exceeded {timeout_seconds}s timeout")
+            cached_body = await cache.get(cache_key) if use_cache else None
+
+            if cached_body is not None:
+                logger.info("Returning cached response for agent: %s", agent_arn)
+                response_body = cached_body
+            else:
+                # Invoke agent in a worker thread so concurrent invocations
+                # overlap instead of blocking the event loop one after another.
+                # wait_for returns control at the deadline; the worker thread
+                # is released later by the client's read timeout.
+                try:
+                    response_body = await asyncio.wait_for(
+                        asyncio.get_running_loop().run_in_executor(
+                            _invoke_executor,
+                            self._invoke_runtime,
+                            agent_arn,
+                            session_id,
+                            qualifier,
+                            payload_bytes,
+                        ),
+                        timeout=timeout_seconds,
+                    )
+                except TimeoutError:
+                    raise TimeoutError(
+                        f"Agent invocation exceeded {timeout_seconds}s timeout"
+                    ) from None
 
             # Parse response
-            response_text = response["response"].read().decode("utf-8")
-            result = json.loads(response_text)
+            if response_model is not None:
+                result = response_model.model_validate_json(response_body)
+            else:
+                result = orjson.loads(response_body)
+
+            # Only cache fresh bodies that decoded cleanly into a success
+            if use_cache and cached_body is None and _is_success(result):
+                await cache.set(cache_key, response_body)
 
             elapsed_ms = int((time.time() - start_time) * 1000)
-            logger.info(f"Agent invocation completed in {elapsed_ms}ms")
+            logger.info("Agent invocation completed in %sms", elapsed_ms)
 
             return result
 
         except ClientError as e:
             error_code = e.response["Error"]["Code"]
             error_msg = e.response["Error"]["Message"]
-            logger.error(f"Agent invocation failed: {error_code} - {error_msg}")
+            logger.error("Agent invocation failed: %s - %s", error_code, error_msg)
             raise Exception(f"Agent invocation failed: {error_msg}")
 
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse agent response: {e}")
+        except (orjson.JSONDecodeError, ValidationError) as e:
+            logger.error("Failed to parse agent response: %s", e)
             raise Exception("Invalid response format from agent")
 
         except TimeoutError:
-            logger.error(f"Agent invocation timed out after {timeout_seconds}s")
+            logger.error("Agent invocation timed out after %ss", timeout_seconds)
             raise
 
         except Exception as e:
-            logger.error(f"Unexpected error during agent invocation: {e}")
+            logger.error("Unexpected error during agent invocation: %s", e)
             raise
 
+    def _invoke_runtime(
+        self, agent_arn: str, session_id: str, qualifier: str, payload_bytes: bytes
+    ) -> bytes:
+        """Invoke the agent runtime and read the full response body (blocking)."""
+        response = self.client.invoke_agent_runtime(
+            runtimeSessionId=session_id,
+            agentRuntimeArn=agent_arn,
+            qualifier=qualifier,
+            payload=payload_bytes,
+        )
+        return response["response"].read()
+
     def _generate_session_id(self) -> str:
         """Generate a unique session ID (must be 33+ characters)."""
-        import uuid
+        return f"session-{token_hex(16)}"
+
+
+def _is_success(result: Any) -> bool:
+    """Whether a decoded agent response reports success (or no status at all)."""
+    status = result.get("status") if isinstance(result, dict) else getattr(result, "status", None)
+    return status is None or status in _SUCCESS_STATUSES
 
-        return f"session-{uuid.uuid4().hex}"
+
+# Agent ARNs by name, resolved once from settings at import time
+_AGENT_ARNS = MappingProxyType(
+    {
+        "project_intelligence": settings.project_intelligence_agent_arn,
+        # Add more agents here as they're deployed:
+        # "code_review": settings.code_review_agent_arn,
+        # "orchestrator": settings.orchestrator_agent_arn,
+    }
+)
 
 
 # Agent registry for easy expansion
@@ -109,19 +218,12 @@ class AgentRegistry:
     @staticmethod
     def get_agent_arn(agent_name: str) -> str:
         """Get the ARN for a named agent."""
-        agents = {
-            "project_intelligence": settings.project_intelligence_agent_arn,
-            # Add more agents here as they're deployed:
-            # "code_review": settings.code_review_agent_arn,
-            # "orchestrator": settings.orchestrator_agent_arn,
-        }
-
-        if agent_name not in agents:
-            raise ValueError(f"Unknown agent: {agent_name}")
-
-        return agents[agent_name]
+        try:
+            return _AGENT_ARNS[agent_name]
+        except KeyError:
+            raise ValueError(f"Unknown agent: {agent_name}") from None
 
     @staticmethod
     def list_agents() -> list[str]:
         """List all registered agents."""
-        return ["project_intelligence"]
+        return list(_AGENT_ARNS)
@@ -1,52 +1,162 @@
-"""Simple in-memory cache for analysis results."""
+"""In-memory and Redis-backed caches for analysis results."""
 
 import logging
+import threading
 import time
+from collections import OrderedDict
 from typing import Any
 
+import orjson
+from pydantic import BaseModel
+
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
 
 class AnalysisCache:
-    """In-memory cache for project analysis results."""
+    """
+    In-memory LRU cache for project analysis results with a TTL.
+
+    Keys are spread over independently locked shards, so it is safe to use
+    from worker threads and concurrent callers rarely wait on each other.
+    LRU eviction is per shard. Methods are coroutines so the cache is
+    interchangeable with RedisAnalysisCache.
+    """
+
+    def __init__(self, max_entries: int | None = None, shards: int = 16):
+        max_entries = max_entries or settings.cache_max_entries
+        self._shard_max_entries = max(1, -(-max_entries // shards))
+        # Insertion order doubles as recency order; hits move to the end
+        self._shards: list[tuple[OrderedDict[str, tuple[Any, float]], threading.Lock]] = [
+            (OrderedDict(), threading.Lock()) for _ in range(shards)
+        ]
 
-    def __init__(self):
-        self._cache: dict[str, tuple[Any, float]] = {}
+    def _shard(self, key: str) -> tuple[OrderedDict[str, tuple[Any, float]], threading.Lock]:
+        """Return the shard dict and lock that own a key."""
+        return self._shards[hash(key) % len(self._shards)]
 
-    def get(self, key: str) -> Any | None:
+    async def get(self, key: str) -> Any | None:
         """Get cached value if not expired."""
-        if key not in self._cache:
-            return None
+        shard, lock = self._shard(key)
+        with lock:
+            try:
+                value, timestamp = shard[key]
+            except KeyError:
+                return None
 
-        value, timestamp = self._cache[key]
+            # Check if expired
+            if time.monotonic() - timestamp > settings.cache_ttl_seconds:
+                del shard[key]
+                expired = True
+            else:
+                shard.move_to_end(key)
+                expired = False
 
-        # Check if expired
-        if time.time() - timestamp > settings.cache_ttl_seconds:
-            logger.info(f"Cache expired for key: {key}")
-            del self._cache[key]
+        if expired:
+            logger.info("Cache expired for key: %s", key)
             return None
 
-        logger.info(f"Cache hit for key: {key}")
+        logger.info("Cache hit for key: %s", key)
         return value
 
-    def set(self, key: str, value: Any) -> None:
-        """Cache a value with current timestamp."""
-        self._cache[key] = (value, time.time())
-        logger.info(f"Cached value for key: {key}")
+    async def set(self, key: str, value: Any) -> None:
+        """Cache a value with current timestamp, evicting least recently used."""
+        shard, lock = self._shard(key)
+        with lock:
+            shard.pop(key, None)
+            shard[key] = (value, time.monotonic())
+            while len(shard) > self._shard_max_entries:
+                shard.popitem(last=False)
+        logger.info("Cached value for key: %s", key)
 
-    def invalidate(self, key: str) -> None:
+    async def invalidate(self, key: str) -> None:
         """Remove a key from cache."""
-        if key in self._cache:
-            del self._cache[key]
-            logger.info(f"Invalidated cache for key: {key}")
+        shard, lock = self._shard(key)
+        with lock:
+            removed = shard.pop(key, None) is not None
+        if removed:
+            logger.info("Invalidated cache for key: %s", key)
 
-    def clear(self) -> None:
+    async def clear(self) -> None:
         """Clear all cached values."""
-        self._cache.clear()
+        for shard, lock in self._shards:
+            with lock:
+                shard.clear()
+        logger.info("Cache cleared")
+
+
+def _encode_default(value: Any) -> Any:
+    """Encode values orjson does not handle natively."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, bytes):
+        return value.decode()
+    raise TypeError(f"Cannot cache value of type {type(value).__name__}")
+
+
+class RedisAnalysisCache:
+    """
+    Redis-backed cache for project analysis results, shared across processes.
+
+    Values are stored as orjson-encoded JSON and expire through Redis's own
+    TTL. Models come back as plain dicts and bytes as str. Redis errors are
+    logged and treated as cache misses so an outage only costs hit rate.
+    """
+
+    def __init__(self, url: str, prefix: str = "analysis-cache:"):
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(url)
+        self._prefix = prefix
+        self._errors = redis.RedisError
+
+    async def get(self, key: str) -> Any | None:
+        """Get cached value if present."""
+        try:
+            data = await self._redis.get(self._prefix + key)
+        except self._errors as e:
+            logger.warning("Cache lookup failed for key %s: %s", key, e)
+            return None
+
+        if data is None:
+            return None
+
+        logger.info("Cache hit for key: %s", key)
+        return orjson.loads(data)
+
+    async def set(self, key: str, value: Any) -> None:
+        """Cache a value for settings.cache_ttl_seconds."""
+        data = orjson.dumps(value, default=_encode_default)
+        try:
+            await self._redis.set(self._prefix + key, data, ex=settings.cache_ttl_seconds)
+        except self._errors as e:
+            logger.warning("Cache store failed for key %s: %s", key, e)
+            return
+        logger.info("Cached value for key: %s", key)
+
+    async def invalidate(self, key: str) -> None:
+        """Remove a key from cache."""
+        try:
+            removed = await self._redis.delete(self._prefix + key)
+        except self._errors as e:
+            logger.warning("Cache invalidation failed for key %s: %s", key, e)
+            return
+        if removed:
+            logger.info("Invalidated cache for key: %s", key)
+
+    async def clear(self) -> None:
+        """Clear all cached values under this cache's prefix."""
+        try:
+            async for redis_key in self._redis.scan_iter(match=self._prefix + "*"):
+                await self._redis.delete(redis_key)
+        except self._errors as e:
+            logger.warning("Cache clear failed: %s", e)
+            return
         logger.info("Cache cleared")
 
 
-# Global cache instance
-cache = AnalysisCache()
+# Global cache instance; Redis shares entries across workers when configured
+cache: AnalysisCache | RedisAnalysisCache = (
+    RedisAnalysisCache(settings.redis_url) if settings.redis_url else AnalysisCache()
+)
@@ -1,39 +1,98 @@
 """Comprehensive error handling and response formatting service."""
 
 import logging
-import traceback
+import time
 from datetime import UTC, datetime
-from typing import Any
+from typing import Any, Final
 
 import httpx
+import orjson
 from fastapi import HTTPException, Request
-from fastapi.responses import JSONResponse
-
-from app.models import ErrorDetail, StandardErrorResponse
+from fastapi.responses import ORJSONResponse
 
 logger = logging.getLogger(__name__)
 
+# (epoch second, ISO string) of the most recently formatted error timestamp
+_last_timestamp: tuple[int, str] = (0, "")
+
+
+def _iso_now() -> str:
+    """
+    Return the current UTC time as an ISO string, truncated to the second.
+
+    The formatted string is reused for every error raised within the same
+    second, which keeps cascading failures from re-formatting it each time.
+    """
+    global _last_timestamp
+    now = int(time.time())
+    if now != _last_timestamp[0]:
+        _last_timestamp = (now, datetime.fromtimestamp(now, UTC).isoformat())
+    return _last_timestamp[1]
+
 
 class ErrorCode:
     """Standard error codes for the application."""
 
     # Validation errors (4xx)
-    INVALID_URL = "INVALID_URL"
-    INVALID_REQUEST = "INVALID_REQUEST"
-    REPOSITORY_NOT_FOUND = "REPOSITORY_NOT_FOUND"
-    RATE_LIMITED = "RATE_LIMITED"
-    UNAUTHORIZED = "UNAUTHORIZED"
+    INVALID_URL: Final = "INVALID_URL"
+    INVALID_REQUEST: Final = "INVALID_REQUEST"
+    REPOSITORY_NOT_FOUND: Final = "REPOSITORY_NOT_FOUND"
+    RATE_LIMITED: Final = "RATE_LIMITED"
+    UNAUTHORIZED: Final = "UNAUTHORIZED"
 
     # Server errors (5xx)
-    AGENT_INVOCATION_FAILED = "AGENT_INVOCATION_FAILED"
-    AGENT_TIMEOUT = "AGENT_TIMEOUT"
-    GITHUB_API_ERROR = "GITHUB_API_ERROR"
-    DATABASE_ERROR = "DATABASE_ERROR"
-    INTERNAL_ERROR = "INTERNAL_ERROR"
+    AGENT_INVOCATION_FAILED: Final = "AGENT_INVOCATION_FAILED"
+    AGENT_TIMEOUT: Final = "AGENT_TIMEOUT"
+    GITHUB_API_ERROR: Final = "GITHUB_API_ERROR"
+    DATABASE_ERROR: Final = "DATABASE_ERROR"
+    INTERNAL_ERROR: Final = "INTERNAL_ERROR"
 
     # Network errors
-    NETWORK_TIMEOUT = "NETWORK_TIMEOUT"
-    CONNECTION_ERROR = "CONNECTION_ERROR"
+    NETWORK_TIMEOUT: Final = "NETWORK_TIMEOUT"
+    CONNECTION_ERROR: Final = "CONNECTION_ERROR"
+
+
+# Constant error payload values; each error gets its own dict built from them
+_GITHUB_URL_FORMAT = "https://github.com/owner/repo"
+_RETRY_AFTER_SECONDS = "3600"
+
+# HTTP status code returned for each error code raised by ErrorHandler
+_STATUS_CODES: dict[str, int] = {
+    ErrorCode.INVALID_REQUEST: 400,
+    ErrorCode.INVALID_URL: 400,
+    ErrorCode.REPOSITORY_NOT_FOUND: 404,
+    ErrorCode.RATE_LIMITED: 429,
+    ErrorCode.AGENT_TIMEOUT: 504,
+    ErrorCode.AGENT_INVOCATION_FAILED: 503,
+    ErrorCode.NETWORK_TIMEOUT: 504,
+    ErrorCode.INTERNAL_ERROR: 500,
+}
+
+
+def _build_http_exception(
+    request_id: str,
+    code: str,
+    message: str,
+    details: dict[str, Any] | None = None,
+    headers: dict[str, str] | None = None,
+) -> HTTPException:
+    """
+    Build an HTTPException whose detail matches StandardErrorResponse.model_dump().
+
+    The detail dict is assembled directly rather than by validating and dumping
+    the response models, which is measurable overhead on hot error paths.
+    """
+    detail = {
+        "success": False,
+        "error": {
+            "code": code,
+            "message": message,
+            "details": details or {},
+            "timestamp": _iso_now(),
+        },
+        "request_id": request_id,
+    }
+    return HTTPException(status_code=_STATUS_CODES[code], detail=detail, headers=headers)
 
 
 class ErrorHandler:
@@ -44,42 +103,6 @@ class ErrorHandler:
     with proper HTTP status codes and request ID tracking.
     """
 
-    @staticmethod
-    def create_error_detail(
-        code: str, message: str, details: dict[str, Any] | None = None
-    ) -> ErrorDetail:
-        """
-        Create a standardized error detail object.
-
-        Args:
-            code: Error code for programmatic handling
-            message: Human-readable error message
-            details: Additional error context
-
-        Returns:
-            ErrorDetail object with timestamp
-        """
-        return ErrorDetail(
-            code=code,
-            message=message,
-            details=details or {},
-            timestamp=datetime.now(UTC).isoformat(),
-        )
-
-    @staticmethod
-    def create_error_response(request_id: str, error_detail: ErrorDetail) -> StandardErrorResponse:
-        """
-        Create a standardized error response.
-
-        Args:
-            request_id: Unique request identifier
-            error_detail: Error details
-
-        Returns:
-            StandardErrorResponse object
-        """
-        return StandardErrorResponse(error=error_detail, request_id=request_id)
-
     @staticmethod
     def log_error(
         request_id: str,
@@ -102,7 +125,7 @@ class ErrorHandler:
             "request_id": request_id,
             "error_code": error_code,
             "error_message": message,  # Renamed to avoid conflict with logging 'message'
-            "timestamp": datetime.now(UTC).isoformat(),
+            "timestamp": _iso_now(),
         }
 
         if extra_context:
@@ -113,11 +136,12 @@ class ErrorHandler:
                 {
                     "exception_type": type(exception).__name__,
                     "exception_message": str(exception),
-                    "traceback": traceback.format_exc(),
                 }
             )
 
-        logger.error(f"[{request_id}] {error_code}: {message}", extra=log_data)
+        # The traceback is attached via exc_info so it is only formatted when a
+        # handler actually emits the record
+        logger.error(f"[{request_id}] {error_code}: {message}", extra=log_data, exc_info=exception)
 
     @classmethod
     def handle_validation_error(
@@ -134,15 +158,14 @@ class ErrorHandler:
         Returns:
             HTTPException with structured error response
         """
-        error_detail = cls.create_error_detail(
-            code=ErrorCode.INVALID_REQUEST, message=message, details=details
-        )
-
         cls.log_error(request_id, ErrorCode.INVALID_REQUEST, message)
 
-        error_response = cls.create_error_response(request_id, error_detail)
-
-        raise HTTPException(status_code=400, detail=error_response.model_dump())
+        raise _build_http_exception(
+            request_id,
+            code=ErrorCode.INVALID_REQUEST,
+            message=message,
+            details=details,
+        )
 
     @classmethod
     def handle_github_url_error(cls, request_id: str, message: str) -> HTTPException:
@@ -156,18 +179,15 @@ class ErrorHandler:
         Returns:
             HTTPException with structured error response
         """
-        error_detail = cls.create_error_detail(
+        cls.log_error(request_id, ErrorCode.INVALID_URL, message)
+
+        raise _build_http_exception(
+            request_id,
             code=ErrorCode.INVALID_URL,
             message=message,
-            details={"expected_format": "https://github.com/owner/repo"},
+            details={"expected_format": _GITHUB_URL_FORMAT},
         )
 
-        cls.log_error(request_id, ErrorCode.INVALID_URL, message)
-
-        error_response = cls.create_error_response(request_id, error_detail)
-
-        raise HTTPException(status_code=400, detail=error_response.model_dump())
-
     @classmethod
     def handle_repository_not_found(cls, request_id: str, repository_url: str) -> HTTPException:
         """
@@ -180,21 +200,18 @@ class ErrorHandler:
         Returns:
             HTTPException with structured error response
         """
-        error_detail = cls.create_error_detail(
-            code=ErrorCode.REPOSITORY_NOT_FOUND,
-            message="Repository not found or is private",
-            details={"repository_url": repository_url},
-        )
-
         cls.log_error(
             request_id,
             ErrorCode.REPOSITORY_NOT_FOUND,
             f"Repository not accessible: {repository_url}",
         )
 
-        error_response = cls.create_error_response(request_id, error_detail)
-
-        raise HTTPException(status_code=404, detail=error_response.model_dump())
+        raise _build_http_exception(
+            request_id,
+            code=ErrorCode.REPOSITORY_NOT_FOUND,
+            message="Repository not found or is private",
+            details={"repository_url": repository_url},
+        )
 
     @classmethod
     def handle_rate_limit_error(
@@ -214,20 +231,14 @@ class ErrorHandler:
         if reset_time:
             details["reset_time"] = reset_time
 
-        error_detail = cls.create_error_detail(
+        cls.log_error(request_id, ErrorCode.RATE_LIMITED, "GitHub API rate limit exceeded")
+
+        raise _build_http_exception(
+            request_id,
             code=ErrorCode.RATE_LIMITED,
             message="GitHub API rate limit exceeded. Please try again later.",
             details=details,
-        )
-
-        cls.log_error(request_id, ErrorCode.RATE_LIMITED, "GitHub API rate limit exceeded")
-
-        error_response = cls.create_error_response(request_id, error_detail)
-
-        raise HTTPException(
-            status_code=429,
-            detail=error_response.model_dump(),
-            headers={"Retry-After": "3600"} if not reset_time else {},
+            headers={"Retry-After": _RETRY_AFTER_SECONDS} if not reset_time else None,
         )
 
     @classmethod
@@ -242,19 +253,16 @@ class ErrorHandler:
         Returns:
             HTTPException with structured error response
         """
-        error_detail = cls.create_error_detail(
-            code=ErrorCode.AGENT_TIMEOUT,
-            message=f"Agent analysis timed out after {timeout_seconds} seconds",
-            details={"timeout_seconds": timeout_seconds},
-        )
-
         cls.log_error(
             request_id, ErrorCode.AGENT_TIMEOUT, f"Agent timeout after {timeout_seconds}s"
         )
 
-        error_response = cls.create_error_response(request_id, error_detail)
-
-        raise HTTPException(status_code=504, detail=error_response.model_dump())
+        raise _build_http_exception(
+            request_id,
+            code=ErrorCode.AGENT_TIMEOUT,
+            message=f"Agent analysis timed out after {timeout_seconds} seconds",
+            details={"timeout_seconds": timeout_seconds},
+        )
 
     @classmethod
     def handle_agent_error(cls, request_id: str, exception: Exception) -> HTTPException:
@@ -272,12 +280,6 @@ class ErrorHandler:
         if isinstance(exception, httpx.TimeoutException):
             return cls.handle_network_timeout(request_id, str(exception))
 
-        error_detail = cls.create_error_detail(
-            code=ErrorCode.AGENT_INVOCATION_FAILED,
-            message="Failed to analyze project with AI agent",
-            details={"error_type": type(exception).__name__},
-        )
-
         cls.log_error(
             request_id,
             ErrorCode.AGENT_INVOCATION_FAILED,
@@ -285,9 +287,12 @@ class ErrorHandler:
             exception=exception,
         )
 
-        error_response = cls.create_error_response(request_id, error_detail)
-
-        raise HTTPException(status_code=503, detail=error_response.model_dump())
+        raise _build_http_exception(
+            request_id,
+            code=ErrorCode.AGENT_INVOCATION_FAILED,
+            message="Failed to analyze project with AI agent",
+            details={"error_type": type(exception).__name__},
+        )
 
     @classmethod
     def handle_network_timeout(cls, request_id: str, service: str) -> HTTPException:
@@ -301,18 +306,15 @@ class ErrorHandler:
         Returns:
             HTTPException with structured error response
         """
-        error_detail = cls.create_error_detail(
+        cls.log_error(request_id, ErrorCode.NETWORK_TIMEOUT, f"Network timeout: {service}")
+
+        raise _build_http_exception(
+            request_id,
             code=ErrorCode.NETWORK_TIMEOUT,
             message=f"Network timeout while connecting to {service}",
             details={"service": service},
         )
 
-        cls.log_error(request_id, ErrorCode.NETWORK_TIMEOUT, f"Network timeout: {service}")
-
-        error_response = cls.create_error_response(request_id, error_detail)
-
-        raise HTTPException(status_code=504, detail=error_response.model_dump())
-
     @classmethod
     def handle_internal_error(cls, request_id: str, exception: Exception) -> HTTPException:
         """
@@ -325,22 +327,19 @@ class ErrorHandler:
         Returns:
             HTTPException with structured error response
         """
-        error_detail = cls.create_error_detail(
-            code=ErrorCode.INTERNAL_ERROR,
-            message="An unexpected error occurred while processing your request",
-            details={"error_type": type(exception).__name__},
-        )
-
         cls.log_error(
             request_id, ErrorCode.INTERNAL_ERROR, "Unexpected internal error", exception=exception
         )
 
-        error_response = cls.create_error_response(request_id, error_detail)
-
-        raise HTTPException(status_code=500, detail=error_response.model_dump())
+        raise _build_http_exception(
+            request_id,
+            code=ErrorCode.INTERNAL_ERROR,
+            message="An unexpected error occurred while processing your request",
+            details={"error_type": type(exception).__name__},
+        )
 
 
-async def global_exception_handler(request: Request, exc: Exception) -> JSONResponse | None:
+async def global_exception_handler(request: Request, exc: Exception) -> ORJSONResponse | None:
     """
     Global exception handler for unhandled exceptions.
 
@@ -349,21 +348,47 @@ async def global_exception_handler(request: Request, exc: Exception) -> JSONResp
         exc: Unhandled exception
 
     Returns:
-        JSONResponse with structured error or None if handled
+        ORJSONResponse with structured error or None if handled
     """
     # Generate request ID if not available
     request_id = getattr(request.state, "request_id", "unknown")
 
     # Handle HTTPException (already processed)
     if isinstance(exc, HTTPException):
-        return JSONResponse(status_code=exc.status_code, content=exc.detail)
+        return ORJSONResponse(status_code=exc.status_code, content=exc.detail)
 
     # Handle unexpected exceptions
     error_handler = ErrorHandler()
     try:
         error_handler.handle_internal_error(request_id, exc)
     except HTTPException as http_exc:
-        return JSONResponse(status_code=http_exc.status_code, content=http_exc.detail)
+        return ORJSONResponse(status_code=http_exc.status_code, content=http_exc.detail)
+
+
+# Attributes every LogRecord has; anything else was passed via ``extra``
+_LOG_RECORD_ATTRS = frozenset(
+    logging.LogRecord("", 0, "", 0, "", (), None).__dict__.keys() | {"message", "asctime"}
+)
+
+
+class JsonLogFormatter(logging.Formatter):
+    """Format log records as single-line JSON for CloudWatch, including ``extra`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        log_entry = {
+            "timestamp": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _LOG_RECORD_ATTRS:
+                log_entry[key] = value
+
+        if record.exc_info:
+            log_entry["traceback"] = self.formatException(record.exc_info)
+
+        return orjson.dumps(log_entry, default=str).decode()
 
 
 def setup_error_logging() -> None:
@@ -373,9 +398,9 @@ def setup_error_logging() -> None:
     Sets up JSON formatting and appropriate log levels for production use.
     """
     # Configure root logger
-    logging.basicConfig(
-        level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    )
+    handler = logging.StreamHandler()
+    handler.setFormatter(JsonLogFormatter())
+    logging.basicConfig(level=logging.INFO, handlers=[handler])
 
     # Set specific log levels
     logging.getLogger("httpx").setLevel(logging.WARNING)
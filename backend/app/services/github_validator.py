@@ -1,17 +1,47 @@
 """GitHub URL validation and repository accessibility service."""
 
+import asyncio
+import hashlib
+import importlib.util
 import logging
-import re
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import NamedTuple
 
 import httpx
 from pydantic import BaseModel
 
 from app.config import settings
+from app.services.rate_limiter import RedisTokenBucket
+from app.services.repo_cache_store import RepoCacheEntry, RepoCacheStore
+
+# google-re2 matches in linear time without backtracking; the patterns below
+# stick to the syntax both engines support
+try:
+    import re2 as regex
+except ImportError:
+    import re as regex
 
 logger = logging.getLogger(__name__)
 
+# HTTP/2 lets concurrent GitHub requests share one connection; it needs the
+# h2 package from the httpx[http2] extra
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Token value shipped in .env.example; treated as no token at all
+_PLACEHOLDER_TOKEN = "github_pat_XXXXXXXXXXXXXXXXXXXXXXXXXXXX"
+
+
+def _auth_headers() -> dict[str, str]:
+    """Authorization header for the configured GitHub token, or none without one."""
+    if settings.github_token and settings.github_token != _PLACEHOLDER_TOKEN:
+        return {"Authorization": f"Bearer {settings.github_token}"}
+    return {}
+
 
 class ValidationResult(NamedTuple):
     """Result of GitHub URL validation."""
@@ -22,6 +52,13 @@ class ValidationResult(NamedTuple):
     error_message: str | None = None
 
 
+class RepositoryLookup(NamedTuple):
+    """Result of a batched repository lookup."""
+
+    exists: bool
+    head_sha: str | None = None
+
+
 class RateLimitInfo(BaseModel):
     """GitHub API rate limit information."""
 
@@ -43,14 +80,53 @@ class GitHubValidator:
     """
 
     # GitHub URL regex pattern - More permissive to allow detailed validation later
-    GITHUB_URL_PATTERN = re.compile(
+    GITHUB_URL_PATTERN = regex.compile(
         r"^https?://(?:www\.)?github\.com/([a-zA-Z0-9][a-zA-Z0-9._-]*)/([a-zA-Z0-9][a-zA-Z0-9._-]*)/?$"
     )
 
+    # Strict URL pattern enforcing the owner and repository name rules below
+    # (except the owner length), so valid URLs are accepted in a single match
+    VALID_GITHUB_URL_PATTERN = regex.compile(
+        r"^https?://(?:www\.)?github\.com/"
+        r"([a-zA-Z0-9](?:-?[a-zA-Z0-9])*)/([a-zA-Z0-9][a-zA-Z0-9._-]{0,99})/?$"
+    )
+
+    # GitHub username rules:
+    # - May only contain alphanumeric characters or single hyphens
+    # - Cannot begin or end with a hyphen
+    # - Maximum 39 characters (checked separately)
+    GITHUB_NAME_PATTERN = regex.compile(r"^[a-zA-Z0-9](?:-?[a-zA-Z0-9])*$")
+
+    # GitHub repository name rules:
+    # - Can contain alphanumeric characters, hyphens, underscores, and periods
+    # - Cannot start with a period or hyphen
+    # - Maximum 100 characters
+    REPO_NAME_PATTERN = regex.compile(r"^[a-zA-Z0-9][a-zA-Z0-9._-]*$")
+
+    # Max repositories resolved per GraphQL request
+    GRAPHQL_BATCH_SIZE = 100
+
+    # Max repositories whose ETag is remembered for conditional requests
+    ETAG_CACHE_MAX_ENTRIES = 10_000
+
+    # How long repository existence results are reused; missing repositories
+    # are rechecked sooner since they may be created or made public
+    EXISTS_TTL_SECONDS = 3600
+    NOT_FOUND_TTL_SECONDS = 300
+    EXISTS_CACHE_MAX_ENTRIES = 10_000
+
+    # How long a head commit SHA is reused before asking GitHub again; short,
+    # since a push within this window is only picked up once it expires
+    HEAD_SHA_TTL_SECONDS = 60
+
     def __init__(self):
         """Initialize the GitHub validator with HTTP client."""
         self._client = httpx.AsyncClient(
-            timeout=30.0,
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=50, max_keepalive_connections=20, keepalive_expiry=30.0
+            ),
+            timeout=httpx.Timeout(30.0, connect=5.0, write=10.0, pool=5.0),
             headers={
                 "User-Agent": "HackaGallery/1.0",
                 "Accept": "application/vnd.github.v3+json",
@@ -58,6 +134,33 @@ class GitHubValidator:
         )
         self._rate_limit_cache: RateLimitInfo | None = None
         self._cache_expiry: datetime | None = None
+        self._rate_limit_lock = asyncio.Lock()
+        # Shares the GitHub request budget across workers when Redis is configured
+        self._request_limiter = (
+            RedisTokenBucket(
+                settings.redis_url,
+                capacity=settings.github_requests_per_hour,
+                refill_seconds=3600,
+            )
+            if settings.redis_url
+            else None
+        )
+        # (exists, expires_at monotonic time) per repository, in LRU order
+        self._exists_cache: OrderedDict[tuple[str, str], tuple[bool, float]] = OrderedDict()
+        # (head SHA, expires_at monotonic time) per repository, in LRU order
+        self._head_sha_cache: OrderedDict[tuple[str, str], tuple[str, float]] = OrderedDict()
+        # ETags of repositories last seen as accessible, in LRU order
+        self._etag_cache: OrderedDict[tuple[str, str], str] = OrderedDict()
+        # Persists lookups across restarts when a cache path is configured;
+        # writes go through one worker thread, off the event loop and in order
+        self._store: RepoCacheStore | None = None
+        self._store_executor: ThreadPoolExecutor | None = None
+        if settings.github_cache_path:
+            self._store = RepoCacheStore(settings.github_cache_path)
+            self._store_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="repo-cache"
+            )
+            self._load_store()
 
     def validate_url(self, url: str) -> ValidationResult:
         """
@@ -75,7 +178,13 @@ class GitHubValidator:
         # Remove trailing whitespace and normalize
         url = url.strip()
 
-        # Check if URL matches GitHub pattern
+        # Fast path: well-formed URLs need only the strict pattern
+        match = self.VALID_GITHUB_URL_PATTERN.match(url)
+        if match and len(match.group(1)) <= 39:
+            owner, repo = match.groups()
+            return ValidationResult(is_valid=True, owner=owner, repo=repo)
+
+        # Otherwise work out which part is invalid for the error message
         match = self.GITHUB_URL_PATTERN.match(url)
         if not match:
             return ValidationResult(
@@ -98,6 +207,44 @@ class GitHubValidator:
 
         return ValidationResult(is_valid=True, owner=owner, repo=repo)
 
+    def validate_urls(self, urls: Iterable[str]) -> list[ValidationResult]:
+        """
+        Validate a batch of GitHub URLs.
+
+        Repeated URLs are validated once and share the same result, which
+        keeps large ingestion batches with duplicates cheap.
+
+        Args:
+            urls: GitHub repository URLs to validate
+
+        Returns:
+            ValidationResult for each URL, in input order
+        """
+        seen: dict[str, ValidationResult] = {}
+        results = []
+        for url in urls:
+            result = seen.get(url)
+            if result is None:
+                result = seen[url] = self.validate_url(url)
+            results.append(result)
+        return results
+
+    def known_to_exist(self, owner: str, repo: str) -> bool:
+        """
+        Whether a recent cached result says the repository exists.
+
+        Makes no request; a missing or expired entry returns False.
+
+        Args:
+            owner: Repository owner username
+            repo: Repository name
+
+        Returns:
+            True if the repository is cached as existing and accessible
+        """
+        cached = self._exists_cache.get((owner, repo))
+        return bool(cached and cached[0] and time.monotonic() < cached[1])
+
     async def check_repository_exists(self, owner: str, repo: str) -> bool:
         """
         Check if a GitHub repository exists and is accessible.
@@ -113,25 +260,30 @@ class GitHubValidator:
             httpx.HTTPError: If there's a network error
             Exception: If rate limited or other API errors
         """
-        # Check rate limits first
-        rate_limit_info = await self.get_rate_limit_info()
-        if rate_limit_info.is_limited:
-            raise Exception(
-                f"GitHub API rate limit exceeded. Resets at {rate_limit_info.reset_time}"
-            )
+        # Reuse a recent result without any request
+        cached = self._exists_cache.get((owner, repo))
+        if cached and time.monotonic() < cached[1]:
+            self._exists_cache.move_to_end((owner, repo))
+            return cached[0]
+
+        # Check rate limits first; the status comes from the headers of earlier
+        # responses, so this costs no extra request
+        is_limited, reset_time = self.is_rate_limited()
+        if is_limited:
+            raise Exception(f"GitHub API rate limit exceeded. Resets at {reset_time}")
 
         try:
             # Use GitHub API to check repository existence
             url = f"https://api.github.com/repos/{owner}/{repo}"
-            headers = {}
+            headers = _auth_headers()
 
-            # Add authentication if GitHub token is available
-            if (
-                settings.github_token
-                and settings.github_token != "github_pat_XXXXXXXXXXXXXXXXXXXXXXXXXXXX"
-            ):
-                headers["Authorization"] = f"Bearer {settings.github_token}"
+            # A conditional request answered with 304 does not count against
+            # the rate limit
+            etag = self._etag_cache.get((owner, repo))
+            if etag:
+                headers["If-None-Match"] = etag
 
+            await self._throttle("github-rest")
             response = await self._client.get(url, headers=headers)
 
             # Update rate limit cache from response headers
@@ -141,10 +293,21 @@ class GitHubValidator:
                 case 200:
                     # Repository exists and is accessible
                     logger.info(f"Repository {owner}/{repo} exists and is accessible")
+                    self._remember_etag(owner, repo, response.headers.get("etag"))
+                    self._remember_exists(owner, repo, True)
+                    return True
+                case 304:
+                    # Unchanged since the last check, which found it accessible
+                    logger.info(f"Repository {owner}/{repo} unchanged and accessible")
+                    if etag:
+                        self._etag_cache.move_to_end((owner, repo))
+                    self._remember_exists(owner, repo, True)
                     return True
                 case 404:
                     # Repository doesn't exist or is private
                     logger.info(f"Repository {owner}/{repo} not found or is private")
+                    self._etag_cache.pop((owner, repo), None)
+                    self._remember_exists(owner, repo, False)
                     return False
                 case 403:
                     # Rate limited or access forbidden
@@ -164,10 +327,183 @@ class GitHubValidator:
             logger.error(f"Network error checking repository {owner}/{repo}: {e}")
             raise Exception(f"Network error: {e}")
 
+    async def check_repositories_exist(
+        self, repositories: list[tuple[str, str]]
+    ) -> dict[tuple[str, str], RepositoryLookup]:
+        """
+        Check whether several GitHub repositories exist in as few requests as possible.
+
+        Repositories are resolved through aliased fields of a GraphQL query,
+        up to GRAPHQL_BATCH_SIZE per request, which also return each default
+        branch's head commit SHA. GraphQL requires a token, so without one
+        nothing is resolved and callers should fall back to
+        check_repository_exists and get_head_sha.
+
+        Args:
+            repositories: (owner, repo) pairs to check
+
+        Returns:
+            Mapping of each resolved (owner, repo) pair to whether it exists
+            and is accessible, and its head commit SHA if it has one
+
+        Raises:
+            Exception: If rate limited or other API errors
+        """
+        if not _auth_headers():
+            return {}
+
+        unique = list(dict.fromkeys(repositories))
+        batches = [
+            unique[i : i + self.GRAPHQL_BATCH_SIZE]
+            for i in range(0, len(unique), self.GRAPHQL_BATCH_SIZE)
+        ]
+        results = {}
+        for batch_result in await asyncio.gather(*map(self._query_repositories, batches)):
+            results.update(batch_result)
+
+        for (owner, repo), lookup in results.items():
+            self._remember_exists(owner, repo, lookup.exists)
+            if lookup.head_sha:
+                self._remember_head_sha(owner, repo, lookup.head_sha)
+        return results
+
+    async def _query_repositories(
+        self, repositories: list[tuple[str, str]]
+    ) -> dict[tuple[str, str], RepositoryLookup]:
+        """
+        Resolve one batch of repositories with a single GraphQL request.
+
+        Args:
+            repositories: (owner, repo) pairs, at most GRAPHQL_BATCH_SIZE
+
+        Returns:
+            Mapping of each resolved (owner, repo) pair to its lookup result
+
+        Raises:
+            Exception: If rate limited or the response carries no data
+        """
+        variables = {}
+        params = []
+        fields = []
+        for i, (owner, repo) in enumerate(repositories):
+            variables[f"o{i}"] = owner
+            variables[f"n{i}"] = repo
+            params.append(f"$o{i}: String!, $n{i}: String!")
+            fields.append(
+                f"r{i}: repository(owner: $o{i}, name: $n{i}) "
+                "{ defaultBranchRef { target { oid } } }"
+            )
+        query = f"query({', '.join(params)}) {{ {' '.join(fields)} }}"
+
+        try:
+            await self._throttle("github-graphql")
+            response = await self._client.post(
+                "https://api.github.com/graphql",
+                json={"query": query, "variables": variables},
+                headers=_auth_headers(),
+            )
+        except httpx.TimeoutException:
+            logger.error(f"Timeout checking {len(repositories)} repositories")
+            raise Exception("GitHub API request timeout")
+        except httpx.NetworkError as e:
+            logger.error(f"Network error checking {len(repositories)} repositories: {e}")
+            raise Exception(f"Network error: {e}")
+
+        if response.status_code != 200:
+            if "rate limit" in response.text.lower():
+                raise Exception("GitHub API rate limit exceeded")
+            logger.error(f"GitHub GraphQL error {response.status_code}: {response.text}")
+            raise Exception(f"GitHub API error: {response.status_code}")
+
+        body = response.json()
+        errors = body.get("errors") or []
+        if any(error.get("type") == "RATE_LIMITED" for error in errors):
+            raise Exception("GitHub API rate limit exceeded")
+
+        data = body.get("data")
+        if data is None:
+            logger.error("GitHub GraphQL returned no data: %s", errors)
+            raise Exception("GitHub API error: no data in GraphQL response")
+
+        # Missing repositories come back as null fields plus NOT_FOUND errors
+        # naming the alias; a null field with any other error is left
+        # unresolved so callers fall back to the REST check.
+        not_found = {
+            error["path"][0]
+            for error in errors
+            if error.get("type") == "NOT_FOUND" and error.get("path")
+        }
+        results = {}
+        for i, pair in enumerate(repositories):
+            node = data.get(f"r{i}")
+            if node is not None:
+                # Empty repositories have no default branch
+                branch = node.get("defaultBranchRef") or {}
+                results[pair] = RepositoryLookup(True, (branch.get("target") or {}).get("oid"))
+            elif f"r{i}" in not_found:
+                results[pair] = RepositoryLookup(False)
+        return results
+
+    async def get_head_sha(self, owner: str, repo: str) -> str | None:
+        """
+        Get the commit SHA at the head of the repository's default branch.
+
+        Used to version cached analyses, so a cached result stays valid until
+        the repository receives a new commit. The request asks GitHub for the
+        bare SHA, which keeps the response to a few dozen bytes. The response
+        also tells whether the repository exists, which is remembered so the
+        accessibility check that follows needs no request of its own.
+
+        Args:
+            owner: Repository owner username
+            repo: Repository name
+
+        Returns:
+            Commit SHA, or None if it could not be determined
+        """
+        cached = self._head_sha_cache.get((owner, repo))
+        if cached and time.monotonic() < cached[1]:
+            self._head_sha_cache.move_to_end((owner, repo))
+            return cached[0]
+
+        # Callers fall back to an unversioned key rather than fail
+        is_limited, _ = self.is_rate_limited()
+        if is_limited:
+            return None
+
+        url = f"https://api.github.com/repos/{owner}/{repo}/commits/HEAD"
+        headers = {"Accept": "application/vnd.github.sha", **_auth_headers()}
+
+        try:
+            await self._throttle("github-rest")
+            response = await self._client.get(url, headers=headers)
+        except httpx.HTTPError as e:
+            logger.warning(f"Failed to get head commit for {owner}/{repo}: {e}")
+            return None
+
+        self._update_rate_limit_cache(response.headers)
+
+        match response.status_code:
+            case 200:
+                self._remember_exists(owner, repo, True)
+                head_sha = response.text.strip()
+                if head_sha:
+                    self._remember_head_sha(owner, repo, head_sha)
+                return head_sha or None
+            case 404:
+                self._etag_cache.pop((owner, repo), None)
+                self._remember_exists(owner, repo, False)
+            case _:
+                logger.info(f"No head commit for {owner}/{repo} (status {response.status_code})")
+        return None
+
     async def get_rate_limit_info(self) -> RateLimitInfo:
         """
         Get current GitHub API rate limit status.
 
+        Concurrent callers that miss the cache share a single request to the
+        rate limit endpoint.
+
         Returns:
             RateLimitInfo with current rate limit status
         """
@@ -175,15 +511,28 @@ class GitHubValidator:
         if self._rate_limit_cache and self._cache_expiry and datetime.now() < self._cache_expiry:
             return self._rate_limit_cache
 
-        try:
-            headers = {}
+        async with self._rate_limit_lock:
+            # Another caller may have refreshed the cache while we waited
             if (
-                settings.github_token
-                and settings.github_token != "github_pat_XXXXXXXXXXXXXXXXXXXXXXXXXXXX"
+                self._rate_limit_cache
+                and self._cache_expiry
+                and datetime.now() < self._cache_expiry
             ):
-                headers["Authorization"] = f"Bearer {settings.github_token}"
+                return self._rate_limit_cache
+
+            return await self._fetch_rate_limit_info()
 
-            response = await self._client.get("https://api.github.com/rate_limit", headers=headers)
+    async def _fetch_rate_limit_info(self) -> RateLimitInfo:
+        """
+        Fetch rate limit status from the GitHub API and cache it.
+
+        Returns:
+            RateLimitInfo with current rate limit status
+        """
+        try:
+            response = await self._client.get(
+                "https://api.github.com/rate_limit", headers=_auth_headers()
+            )
 
             if response.status_code == 200:
                 data = response.json()
@@ -226,10 +575,14 @@ class GitHubValidator:
         # No cached info available
         return False, None
 
-    def _is_valid_github_name(self, name: str) -> bool:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _is_valid_github_name(name: str) -> bool:
         """
         Validate GitHub username format.
 
+        Results are memoized, as the same owners are validated repeatedly.
+
         Args:
             name: Username to validate
 
@@ -239,17 +592,16 @@ class GitHubValidator:
         if not name or len(name) > 39:
             return False
 
-        # GitHub username rules:
-        # - May only contain alphanumeric characters or single hyphens
-        # - Cannot begin or end with a hyphen
-        # - Maximum 39 characters
-        pattern = re.compile(r"^[a-zA-Z0-9](?:[a-zA-Z0-9]|-(?=[a-zA-Z0-9])){0,38}$")
-        return bool(pattern.match(name))
+        return bool(GitHubValidator.GITHUB_NAME_PATTERN.match(name))
 
-    def _is_valid_repo_name(self, name: str) -> bool:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _is_valid_repo_name(name: str) -> bool:
         """
         Validate GitHub repository name format.
 
+        Results are memoized, as the same repositories are validated repeatedly.
+
         Args:
             name: Repository name to validate
 
@@ -259,12 +611,92 @@ class GitHubValidator:
         if not name or len(name) > 100:
             return False
 
-        # GitHub repository name rules:
-        # - Can contain alphanumeric characters, hyphens, underscores, and periods
-        # - Cannot start with a period or hyphen
-        # - Maximum 100 characters
-        pattern = re.compile(r"^[a-zA-Z0-9][a-zA-Z0-9._-]*$")
-        return bool(pattern.match(name))
+        return bool(GitHubValidator.REPO_NAME_PATTERN.match(name))
+
+    async def _throttle(self, bucket: str) -> None:
+        """
+        Wait for a request slot in a shared per-token bucket.
+
+        Does nothing unless Redis is configured. REST and GraphQL requests
+        draw from separate buckets, as GitHub budgets them separately.
+
+        Args:
+            bucket: Bucket name, e.g. "github-rest"
+        """
+        if self._request_limiter is None:
+            return
+
+        # Buckets are per token so several tokens get independent budgets
+        token_id = hashlib.sha256((settings.github_token or "").encode()).hexdigest()[:16]
+        await self._request_limiter.acquire(f"{bucket}:{token_id}")
+
+    def _remember_exists(self, owner: str, repo: str, exists: bool) -> None:
+        """
+        Cache a repository existence result for its TTL.
+
+        Args:
+            owner: Repository owner username
+            repo: Repository name
+            exists: Whether the repository exists and is accessible
+        """
+        key = (owner, repo)
+        ttl = self.EXISTS_TTL_SECONDS if exists else self.NOT_FOUND_TTL_SECONDS
+        self._exists_cache[key] = (exists, time.monotonic() + ttl)
+        self._exists_cache.move_to_end(key)
+        if len(self._exists_cache) > self.EXISTS_CACHE_MAX_ENTRIES:
+            self._exists_cache.popitem(last=False)
+
+        if self._store is not None:
+            entry = RepoCacheEntry(
+                owner, repo, exists, self._etag_cache.get(key), time.time() + ttl
+            )
+            self._store_executor.submit(self._store.save, entry)
+
+    def _load_store(self) -> None:
+        """Seed the in-memory caches from the persistent store."""
+        now = time.time()
+        now_monotonic = time.monotonic()
+        for entry in self._store.load(self.EXISTS_CACHE_MAX_ENTRIES):
+            key = (entry.owner, entry.repo)
+            if entry.etag:
+                self._etag_cache[key] = entry.etag
+            if entry.expires_at > now:
+                # Stored expiry is wall-clock time; the cache uses monotonic time
+                self._exists_cache[key] = (entry.exists, now_monotonic + entry.expires_at - now)
+
+    def _remember_head_sha(self, owner: str, repo: str, head_sha: str) -> None:
+        """
+        Cache a repository's head commit SHA for HEAD_SHA_TTL_SECONDS.
+
+        Args:
+            owner: Repository owner username
+            repo: Repository name
+            head_sha: Commit SHA at the head of the default branch
+        """
+        key = (owner, repo)
+        self._head_sha_cache[key] = (head_sha, time.monotonic() + self.HEAD_SHA_TTL_SECONDS)
+        self._head_sha_cache.move_to_end(key)
+        if len(self._head_sha_cache) > self.EXISTS_CACHE_MAX_ENTRIES:
+            self._head_sha_cache.popitem(last=False)
+
+    def _remember_etag(self, owner: str, repo: str, etag: str | None) -> None:
+        """
+        Remember a repository's ETag for later conditional requests.
+
+        Args:
+            owner: Repository owner username
+            repo: Repository name
+            etag: ETag response header, if any
+        """
+        key = (owner, repo)
+        if not etag:
+            self._etag_cache.pop(key, None)
+            return
+
+        self._etag_cache[key] = etag
+        self._etag_cache.move_to_end(key)
+        if len(self._etag_cache) > self.ETAG_CACHE_MAX_ENTRIES:
+            self._etag_cache.popitem(last=False)
 
     def _update_rate_limit_cache(self, headers: dict) -> None:
         """
@@ -329,6 +761,10 @@ class GitHubValidator:
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
         await self._client.aclose()
+        if self._store is not None:
+            # Queued after any pending writes, so they are flushed first
+            await asyncio.wrap_future(self._store_executor.submit(self._store.close))
+            self._store_executor.shutdown()
 
 
 # Global validator instance
@@ -3,8 +3,11 @@
 import asyncio
 import logging
 import time
+from collections import defaultdict
+from functools import lru_cache
 from typing import Any
 
+from app.config import settings
 from app.models import AgentTask, WorkflowRequest
 from app.services.agent_client import AgentCoreClient, AgentRegistry
 
@@ -21,8 +24,11 @@ class AgentOrchestrator:
     - Conditional: Execute agents based on previous results
     """
 
-    def __init__(self):
+    def __init__(self, max_concurrency: int | None = None):
         self.client = AgentCoreClient()
+        # Caps in-flight agent invocations across all workflows sharing this
+        # orchestrator so large parallel workflows don't flood AgentCore
+        self._semaphore = asyncio.Semaphore(max_concurrency or settings.workflow_max_concurrency)
 
     async def execute_workflow(self, workflow: WorkflowRequest) -> dict[str, Any]:
         """
@@ -32,14 +38,16 @@ class AgentOrchestrator:
             workflow: Workflow definition with tasks and execution pattern
 
         Returns:
-            Aggregated results from all agents
+            Aggregated results from all agents, plus per-task errors for tasks
+            that failed or were skipped in a parallel workflow
         """
         start_time = time.time()
+        errors: dict[str, str] = {}
 
         if workflow.workflow_type == "sequential":
             results = await self._execute_sequential(workflow.tasks)
         elif workflow.workflow_type == "parallel":
-            results = await self._execute_parallel(workflow.tasks)
+            results = await self._execute_parallel(workflow.tasks, errors)
         elif workflow.workflow_type == "conditional":
             results = await self._execute_conditional(workflow.tasks)
         else:
@@ -51,6 +59,7 @@ class AgentOrchestrator:
             "results": results,
             "execution_order": list(results.keys()),
             "total_time_ms": elapsed_ms,
+            "errors": errors,
         }
 
     async def _execute_sequential(self, tasks: list[AgentTask]) -> dict[str, Any]:
@@ -58,36 +67,61 @@ class AgentOrchestrator:
         results = {}
 
         for task in tasks:
-            logger.info(f"Executing task: {task.agent_name}")
+            logger.info("Executing task: %s", task.agent_name)
 
             # Resolve dependencies
             input_data = self._resolve_dependencies(task, results)
 
-            # Get agent ARN
-            agent_arn = AgentRegistry.get_agent_arn(task.agent_name)
-
             # Invoke agent
-            result = await self.client.invoke_agent(agent_arn, input_data)
+            result = await self._invoke(task, input_data)
             results[task.agent_name] = result
 
         return results
 
-    async def _execute_parallel(self, tasks: list[AgentTask]) -> dict[str, Any]:
-        """Execute tasks concurrently."""
-        # Group tasks by dependency level
-        task_groups = self._group_by_dependencies(tasks)
-        results = {}
-
-        for group in task_groups:
-            # Execute all tasks in this group concurrently
-            group_tasks = [self._execute_task(task, results) for task in group]
-            group_results = await asyncio.gather(*group_tasks)
+    async def _execute_parallel(
+        self, tasks: list[AgentTask], errors: dict[str, str]
+    ) -> dict[str, Any]:
+        """
+        Execute tasks concurrently, each as soon as its own dependencies finish.
 
-            # Merge results
-            for task, result in zip(group, group_results):
-                results[task.agent_name] = result
+        There is no barrier between dependency levels: a task waits only for
+        the tasks it depends on. A failing task does not abort the others;
+        its error is recorded in errors and any task depending on it is
+        skipped. Results are returned in dependency level order.
+        """
+        # Validates the graph (raising on cycles) and fixes the result order
+        ordered = [task for group in self._group_by_dependencies(tasks) for task in group]
+        results: dict[str, Any] = {}
+        # First scheduled run per agent name, which dependents wait on
+        runs: dict[str, asyncio.Task[None]] = {}
+
+        async def run(task: AgentTask) -> None:
+            await asyncio.gather(*(runs[dep] for dep in set(task.depends_on)))
+
+            failed_deps = [dep for dep in task.depends_on if dep in errors]
+            if failed_deps:
+                logger.info("Skipping task %s - dependencies failed", task.agent_name)
+                errors[task.agent_name] = f"Skipped: dependencies failed: {failed_deps}"
+                return
+
+            try:
+                results[task.agent_name] = await self._execute_task(task, results)
+            except Exception as e:
+                logger.error("Task %s failed: %s", task.agent_name, e)
+                errors[task.agent_name] = f"{type(e).__name__}: {e}"
+
+        all_runs = []
+        for task in ordered:
+            task_run = asyncio.create_task(run(task))
+            runs.setdefault(task.agent_name, task_run)
+            all_runs.append(task_run)
+        await asyncio.gather(*all_runs)
 
-        return results
+        return {
+            task.agent_name: results[task.agent_name]
+            for task in ordered
+            if task.agent_name in results
+        }
 
     async def _execute_conditional(self, tasks: list[AgentTask]) -> dict[str, Any]:
         """Execute tasks based on conditions from previous results."""
@@ -96,19 +130,16 @@ class AgentOrchestrator:
         for task in tasks:
             # Check if dependencies are met
             if not self._check_dependencies(task, results):
-                logger.info(f"Skipping task {task.agent_name} - dependencies not met")
+                logger.info("Skipping task %s - dependencies not met", task.agent_name)
                 continue
 
-            logger.info(f"Executing task: {task.agent_name}")
+            logger.info("Executing task: %s", task.agent_name)
 
             # Resolve dependencies
             input_data = self._resolve_dependencies(task, results)
 
-            # Get agent ARN
-            agent_arn = AgentRegistry.get_agent_arn(task.agent_name)
-
             # Invoke agent
-            result = await self.client.invoke_agent(agent_arn, input_data)
+            result = await self._invoke(task, input_data)
             results[task.agent_name] = result
 
         return results
@@ -116,43 +147,102 @@ class AgentOrchestrator:
     async def _execute_task(self, task: AgentTask, results: dict[str, Any]) -> Any:
         """Execute a single task."""
         input_data = self._resolve_dependencies(task, results)
+        return await self._invoke(task, input_data)
+
+    async def _invoke(self, task: AgentTask, input_data: dict[str, Any]) -> Any:
+        """Invoke a task's agent once a concurrency slot is free."""
         agent_arn = AgentRegistry.get_agent_arn(task.agent_name)
-        return await self.client.invoke_agent(agent_arn, input_data)
+        async with self._semaphore:
+            return await self.client.invoke_agent(agent_arn, input_data, use_cache=task.cache)
 
     def _resolve_dependencies(self, task: AgentTask, results: dict[str, Any]) -> dict[str, Any]:
-        """Resolve task dependencies and merge with input data."""
-        input_data = task.input_data.copy()
+        """
+        Resolve task dependencies and merge with input data.
 
-        for dep in task.depends_on:
-            if dep in results:
-                input_data[f"{dep}_result"] = results[dep]
+        The task's input_data is returned as-is when there is nothing to
+        merge; callers must treat the result as read-only.
+        """
+        dep_results = {f"{dep}_result": results[dep] for dep in task.depends_on if dep in results}
+        if not dep_results:
+            return task.input_data
 
-        return input_data
+        return {**task.input_data, **dep_results}
 
     def _check_dependencies(self, task: AgentTask, results: dict[str, Any]) -> bool:
         """Check if all dependencies are satisfied."""
         return all(dep in results for dep in task.depends_on)
 
     def _group_by_dependencies(self, tasks: list[AgentTask]) -> list[list[AgentTask]]:
-        """Group tasks by dependency level for parallel execution."""
-        groups = []
-        remaining = tasks.copy()
-        completed = set()
+        """
+        Group tasks by dependency level for parallel execution.
 
-        while remaining:
-            # Find tasks with no unmet dependencies
-            current_group = [
-                task for task in remaining if all(dep in completed for dep in task.depends_on)
-            ]
+        Levels depend only on the workflow's shape, so they are memoized by
+        each task's agent name and dependencies and reused when the same
+        workflow template runs again with different input data.
+        """
+        signature = tuple((task.agent_name, frozenset(task.depends_on)) for task in tasks)
+        return [[tasks[i] for i in level] for level in _dependency_levels(signature)]
+
+
+@lru_cache(maxsize=256)
+def _dependency_levels(
+    signature: tuple[tuple[str, frozenset[str]], ...],
+) -> tuple[tuple[int, ...], ...]:
+    """
+    Compute dependency levels as task positions for a workflow shape.
+
+    Uses Kahn's algorithm: each task counts its unmet dependencies, and a
+    task joins the next level once the count drops to zero, so every task
+    and dependency edge is visited once.
+    """
+    # Unmet dependency count per task position, and the positions waiting
+    # on each agent name
+    indegree = {}
+    dependents: dict[str, list[int]] = defaultdict(list)
+    for i, (_, dependencies) in enumerate(signature):
+        indegree[i] = len(dependencies)
+        for dep in dependencies:
+            dependents[dep].append(i)
+
+    levels = []
+    completed: set[str] = set()
+    ready = [i for i, count in indegree.items() if count == 0]
+
+    while ready:
+        levels.append(tuple(ready))
+
+        next_ready = []
+        for i in ready:
+            name = signature[i][0]
+            if name in completed:
+                continue
+            completed.add(name)
+            for dependent in dependents[name]:
+                indegree[dependent] -= 1
+                if indegree[dependent] == 0:
+                    next_ready.append(dependent)
 
-            if not current_group:
-                raise ValueError("Circular dependency detected in workflow")
+        # Keep workflow order within a level
+        ready = sorted(next_ready)
 
-            groups.append(current_group)
+    if sum(len(level) for level in levels) < len(signature):
+        raise ValueError("Circular dependency detected in workflow")
 
-            # Mark as completed
-            for task in current_group:
-                completed.add(task.agent_name)
-                remaining.remove(task)
+    return tuple(levels)
 
-        return groups
+
+# Global orchestrator instance
+_orchestrator_instance: AgentOrchestrator | None = None
+
+
+def get_orchestrator() -> AgentOrchestrator:
+    """
+    Get or create a global AgentOrchestrator instance.
+
+    Returns:
+        AgentOrchestrator instance
+    """
+    global _orchestrator_instance
+    if _orchestrator_instance is None:
+        _orchestrator_instance = AgentOrchestrator()
+    return _orchestrator_instance
@@ -0,0 +1,68 @@
+"""Redis-backed token bucket for rate limits shared across processes."""
+
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Refills the bucket for the time elapsed since the last call and takes one
+# token if available. Returns the seconds to wait before a token is free
+# (0 if one was taken) as a string, since Lua numbers come back truncated.
+_TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RedisTokenBucket:
+    """
+    Token bucket kept in Redis, so every worker draws from the same budget.
+
+    The refill and take happen atomically in a Lua script using Redis's
+    clock. If Redis is unavailable the limiter lets calls through rather
+    than blocking requests.
+    """
+
+    def __init__(self, url: str, capacity: int, refill_seconds: float, prefix: str = "ratelimit:"):
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(url)
+        self._script = self._redis.register_script(_TOKEN_BUCKET_SCRIPT)
+        self._errors = redis.RedisError
+        self._capacity = capacity
+        self._rate = capacity / refill_seconds
+        self._prefix = prefix
+
+    async def acquire(self, name: str) -> None:
+        """Wait until a token is available in the named bucket and take it."""
+        while True:
+            try:
+                wait = float(
+                    await self._script(
+                        keys=[self._prefix + name], args=[self._capacity, self._rate]
+                    )
+                )
+            except self._errors as e:
+                logger.warning("Rate limiter unavailable for %s: %s", name, e)
+                return
+
+            if wait <= 0:
+                return
+
+            logger.info("Rate limit bucket %s empty, waiting %.2fs", name, wait)
+            await asyncio.sleep(wait)
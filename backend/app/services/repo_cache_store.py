@@ -0,0 +1,83 @@
+"""SQLite store for GitHub repository lookups that outlives the process."""
+
+import logging
+import sqlite3
+import time
+from typing import NamedTuple
+
+logger = logging.getLogger(__name__)
+
+
+class RepoCacheEntry(NamedTuple):
+    """A persisted repository lookup; expires_at is a Unix timestamp."""
+
+    owner: str
+    repo: str
+    exists: bool
+    etag: str | None
+    expires_at: float
+
+
+class RepoCacheStore:
+    """
+    Persists repository existence results and ETags to a SQLite file.
+
+    Lets a restarted or redeployed worker start with the results of the
+    previous one instead of re-checking every repository against GitHub.
+    Calls block, so async code should run them in a worker thread. Not
+    shared across hosts; use Redis for that.
+    """
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS repo_cache ("
+            "owner TEXT NOT NULL, repo TEXT NOT NULL, exists_flag INTEGER NOT NULL, "
+            "etag TEXT, expires_at REAL NOT NULL, PRIMARY KEY (owner, repo))"
+        )
+
+    def load(self, limit: int) -> list[RepoCacheEntry]:
+        """
+        Load the most recently stored entries that are still useful.
+
+        Expired entries are kept while they have an ETag, since it still
+        makes the next check a free conditional request.
+
+        Args:
+            limit: Maximum number of entries to load
+
+        Returns:
+            Entries ordered oldest to newest
+        """
+        try:
+            self._conn.execute(
+                "DELETE FROM repo_cache WHERE expires_at <= ? AND etag IS NULL", (time.time(),)
+            )
+            rows = self._conn.execute(
+                "SELECT owner, repo, exists_flag, etag, expires_at FROM repo_cache "
+                "ORDER BY expires_at DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning("Failed to load repository cache: %s", e)
+            return []
+
+        return [
+            RepoCacheEntry(owner, repo, bool(exists), etag, expires_at)
+            for owner, repo, exists, etag, expires_at in reversed(rows)
+        ]
+
+    def save(self, entry: RepoCacheEntry) -> None:
+        """Insert or replace the entry for a repository."""
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO repo_cache VALUES (?, ?, ?, ?, ?)",
+                (entry.owner, entry.repo, int(entry.exists), entry.etag, entry.expires_at),
+            )
+        except sqlite3.Error as e:
+            logger.warning("Failed to persist %s/%s: %s", entry.owner, entry.repo, e)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
@@ -9,16 +9,35 @@ This script tests:
 4. Error scenarios (invalid URL, repository not found, rate limits)
 
 Usage:
-    python test_api_local.py
+    python test_api_local.py [--full-cache-test]
+
+The cache test probes /api/projects/cache-status after one analysis; pass
+--full-cache-test to time a second full analysis instead.
+
+The private repository test is skipped unless RUN_PRIVATE_REPO_TEST=1.
 """
 
 import asyncio
-import json
+import os
 import sys
 import time
 from typing import Any
 
 import httpx
+import orjson
+
+# uvloop's libuv-based event loop has lower scheduling overhead; it is a dev
+# dependency on non-Windows platforms, so fall back to asyncio's loop
+try:
+    from uvloop import run
+except ImportError:
+    from asyncio import run
+
+# Endpoint under test, relative to the client's base_url
+ANALYZE_PATH = "/api/projects/analyze"
+CACHE_STATUS_PATH = "/api/projects/cache-status"
+# Headers for POSTs whose JSON body is serialized up front
+JSON_HEADERS = {"Content-Type": "application/json"}
 
 
 class Colors:
@@ -35,10 +54,24 @@ class Colors:
 class APITester:
     """Test harness for backend API."""
 
-    def __init__(self, base_url: str = "http://localhost:8000"):
+    _HEADER_BAR = f"{Colors.BOLD}{Colors.BLUE}{'=' * 70}{Colors.RESET}"
+
+    def __init__(self, base_url: str = "http://localhost:8000", full_cache_test: bool = False):
         self.base_url = base_url
-        self.client = httpx.AsyncClient(timeout=60.0)
+        # Re-run the full analysis in the cache test instead of probing
+        self.full_cache_test = full_cache_test
+        # One pooled client for every test; HTTP/2 applies to https base URLs
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            http2=True,
+            timeout=httpx.Timeout(60.0, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=32, max_keepalive_connections=16, keepalive_expiry=30.0
+            ),
+        )
         self.test_results: list[dict[str, Any]] = []
+        self._passed_count = 0
+        self._skipped_count = 0
 
     async def __aenter__(self):
         return self
@@ -48,9 +81,9 @@ class APITester:
 
     def print_header(self, text: str) -> None:
         """Print a formatted test section header."""
-        print(f"\n{Colors.BOLD}{Colors.BLUE}{'=' * 70}{Colors.RESET}")
-        print(f"{Colors.BOLD}{Colors.BLUE}{text}{Colors.RESET}")
-        print(f"{Colors.BOLD}{Colors.BLUE}{'=' * 70}{Colors.RESET}\n")
+        print(
+            f"\n{self._HEADER_BAR}\n{Colors.BOLD}{Colors.BLUE}{text}{Colors.RESET}\n{self._HEADER_BAR}\n"
+        )
 
     def print_test(self, name: str) -> None:
         """Print test name."""
@@ -68,22 +101,26 @@ class APITester:
         """Print warning message."""
         print(f"{Colors.YELLOW}⚠ {message}{Colors.RESET}")
 
-    def print_info(self, message: str) -> None:
-        """Print info message."""
-        print(f"  {message}")
+    def print_info(self, *messages: str) -> None:
+        """Print info messages, one indented line each, in a single write."""
+        print("\n".join(f"  {message}" for message in messages))
 
-    def record_result(self, test_name: str, passed: bool, message: str = "") -> None:
-        """Record test result."""
+    def record_result(self, test_name: str, passed: bool | None, message: str = "") -> None:
+        """Record test result; passed is None for a skipped test."""
         self.test_results.append({"test": test_name, "passed": passed, "message": message})
+        if passed is None:
+            self._skipped_count += 1
+        elif passed:
+            self._passed_count += 1
 
     async def test_server_health(self) -> bool:
         """Test 1: Server health check."""
         self.print_test("Server health check")
 
         try:
-            response = await self.client.get(f"{self.base_url}/")
+            response = await self.client.get("/")
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 self.print_success(f"Server is healthy: {data}")
                 self.record_result("Server Health", True)
                 return True
@@ -101,13 +138,14 @@ class APITester:
         self.print_test("Detailed health endpoint")
 
         try:
-            response = await self.client.get(f"{self.base_url}/health")
+            response = await self.client.get("/health")
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 self.print_success("Health endpoint returned detailed info")
                 self.print_info(f"Status: {data.get('status')}")
                 self.print_info(f"Agents: {data.get('agents')}")
-                self.print_info(f"Config: {json.dumps(data.get('config'), indent=2)}")
+                config = orjson.dumps(data.get("config"), option=orjson.OPT_INDENT_2)
+                self.print_info(f"Config: {config.decode()}")
                 self.record_result("Health Endpoint", True)
                 return True
             else:
@@ -132,28 +170,29 @@ class APITester:
             self.print_info(f"Analyzing: {test_repo}")
             self.print_info("This may take 15-30 seconds...")
 
-            start_time = time.time()
-            response = await self.client.post(f"{self.base_url}/api/projects/analyze", json=payload)
-            elapsed = time.time() - start_time
+            start_ns = time.perf_counter_ns()
+            response = await self.client.post(ANALYZE_PATH, json=payload)
+            elapsed = (time.perf_counter_ns() - start_ns) / 1e9
 
             self.print_info(f"Response time: {elapsed:.2f}s")
 
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
 
                 # Verify response structure
                 if data.get("success"):
                     self.print_success("Analysis completed successfully")
 
                     analysis = data.get("data", {})
-                    self.print_info(f"Request ID: {data.get('request_id')}")
-                    self.print_info(f"Summary: {analysis.get('summary', 'N/A')[:100]}...")
-                    self.print_info(f"Technologies: {len(analysis.get('technologies', []))}")
-                    self.print_info(f"Tags: {len(analysis.get('tags', []))}")
-                    self.print_info(f"Key Features: {len(analysis.get('key_features', []))}")
-
                     metadata = analysis.get("metadata", {})
-                    self.print_info(f"Processing time: {metadata.get('processing_time_ms')}ms")
+                    self.print_info(
+                        f"Request ID: {data.get('request_id')}",
+                        f"Summary: {analysis.get('summary', 'N/A')[:100]}...",
+                        f"Technologies: {len(analysis.get('technologies', []))}",
+                        f"Tags: {len(analysis.get('tags', []))}",
+                        f"Key Features: {len(analysis.get('key_features', []))}",
+                        f"Processing time: {metadata.get('processing_time_ms')}ms",
+                    )
 
                     self.record_result("Valid Repository Analysis", True)
                     return True
@@ -190,27 +229,30 @@ class APITester:
 
         all_passed = True
 
-        for url in invalid_urls:
-            payload = {"repository_url": url}
+        bodies = [orjson.dumps({"repository_url": url}) for url in invalid_urls]
 
-            try:
-                response = await self.client.post(
-                    f"{self.base_url}/api/projects/analyze", json=payload
-                )
-
-                if response.status_code == 400:
-                    data = response.json()
-                    self.print_success(f"Correctly rejected: {url}")
-                    self.print_info(f"Error: {data.get('error', {}).get('message')}")
-                elif response.status_code == 422:
-                    # Pydantic validation error
-                    self.print_success(f"Correctly rejected by validation: {url}")
-                else:
-                    self.print_error(f"Expected 400/422, got {response.status_code} for: {url}")
-                    all_passed = False
+        # The server rejects these without calling out, so send them together
+        responses = await asyncio.gather(
+            *(
+                self.client.post(ANALYZE_PATH, content=body, headers=JSON_HEADERS)
+                for body in bodies
+            ),
+            return_exceptions=True,
+        )
 
-            except Exception as e:
-                self.print_error(f"Test failed for {url}: {e}")
+        for url, response in zip(invalid_urls, responses, strict=True):
+            if isinstance(response, Exception):
+                self.print_error(f"Test failed for {url}: {response}")
+                all_passed = False
+            elif response.status_code == 400:
+                data = orjson.loads(response.content)
+                self.print_success(f"Correctly rejected: {url}")
+                self.print_info(f"Error: {data.get('error', {}).get('message')}")
+            elif response.status_code == 422:
+                # Pydantic validation error
+                self.print_success(f"Correctly rejected by validation: {url}")
+            else:
+                self.print_error(f"Expected 400/422, got {response.status_code} for: {url}")
                 all_passed = False
 
         self.record_result("Invalid URL Format", all_passed)
@@ -226,10 +268,10 @@ class APITester:
         payload = {"repository_url": nonexistent_repo}
 
         try:
-            response = await self.client.post(f"{self.base_url}/api/projects/analyze", json=payload)
+            response = await self.client.post(ANALYZE_PATH, json=payload)
 
             if response.status_code == 404:
-                data = response.json()
+                data = orjson.loads(response.content)
                 self.print_success("Correctly returned 404 for nonexistent repository")
                 self.print_info(f"Error: {data.get('error', {}).get('message')}")
                 self.record_result("Repository Not Found", True)
@@ -249,6 +291,12 @@ class APITester:
         """Test 6: Private repository (should fail without access)."""
         self.print_test("Private repository access")
 
+        # Its outcome depends on the token's access, so only run it on request
+        if os.getenv("RUN_PRIVATE_REPO_TEST") != "1":
+            self.print_warning("Skipped (set RUN_PRIVATE_REPO_TEST=1 to run)")
+            self.record_result("Private Repository", None, "Skipped")
+            return True
+
         # Use a known private repository pattern
         # Note: This will fail unless the GitHub token has access
         private_repo = "https://github.com/github/private-test-repo"
@@ -256,10 +304,10 @@ class APITester:
         payload = {"repository_url": private_repo}
 
         try:
-            response = await self.client.post(f"{self.base_url}/api/projects/analyze", json=payload)
+            response = await self.client.post(ANALYZE_PATH, json=payload)
 
             if response.status_code in [404, 403]:
-                data = response.json()
+                data = orjson.loads(response.content)
                 self.print_success("Correctly handled private repository")
                 self.print_info(f"Status: {response.status_code}")
                 self.print_info(f"Error: {data.get('error', {}).get('message')}")
@@ -280,34 +328,34 @@ class APITester:
             return False
 
     async def test_cache_functionality(self) -> bool:
-        """Test 7: Cache functionality (second request should be faster)."""
+        """Test 7: Cache functionality (analysis should be cached after one request)."""
         self.print_test("Cache functionality")
 
         # Use a different repository to avoid cache from previous tests
         test_repo = "https://github.com/torvalds/linux"
-        payload = {"repository_url": test_repo}
+        # Serialized once, outside the timed requests
+        body = orjson.dumps({"repository_url": test_repo})
 
         try:
             # First request
             self.print_info("First request (should invoke agent)...")
-            start_time = time.time()
-            response1 = await self.client.post(
-                f"{self.base_url}/api/projects/analyze", json=payload
-            )
-            elapsed1 = time.time() - start_time
+            start_ns = time.perf_counter_ns()
+            response1 = await self.client.post(ANALYZE_PATH, content=body, headers=JSON_HEADERS)
+            elapsed1 = (time.perf_counter_ns() - start_ns) / 1e9
 
             if response1.status_code != 200:
                 self.print_error(f"First request failed: {response1.status_code}")
                 self.record_result("Cache Functionality", False, "First request failed")
                 return False
 
+            if not self.full_cache_test:
+                return await self._probe_cache(test_repo, elapsed1)
+
             # Second request (should be cached)
             self.print_info("Second request (should use cache)...")
-            start_time = time.time()
-            response2 = await self.client.post(
-                f"{self.base_url}/api/projects/analyze", json=payload
-            )
-            elapsed2 = time.time() - start_time
+            start_ns = time.perf_counter_ns()
+            response2 = await self.client.post(ANALYZE_PATH, content=body, headers=JSON_HEADERS)
+            elapsed2 = (time.perf_counter_ns() - start_ns) / 1e9
 
             if response2.status_code != 200:
                 self.print_error(f"Second request failed: {response2.status_code}")
@@ -317,6 +365,15 @@ class APITester:
             self.print_info(f"First request: {elapsed1:.2f}s")
             self.print_info(f"Second request: {elapsed2:.2f}s")
 
+            # A cache hit returns the stored analysis unchanged; only the
+            # request_id differs between the two responses
+            data1 = orjson.loads(response1.content).get("data")
+            data2 = orjson.loads(response2.content).get("data")
+            if data1 != data2:
+                self.print_error("Second response returned a different analysis")
+                self.record_result("Cache Functionality", False, "Analysis differs")
+                return False
+
             # Second request should be significantly faster (cached)
             if elapsed2 < elapsed1 * 0.5:  # At least 50% faster
                 self.print_success("Cache is working (second request was faster)")
@@ -334,6 +391,29 @@ class APITester:
             self.record_result("Cache Functionality", False, str(e))
             return False
 
+    async def _probe_cache(self, test_repo: str, elapsed1: float) -> bool:
+        """Check the cache-status endpoint instead of a second full analysis."""
+        self.print_info("Probing cache status...")
+        start_ns = time.perf_counter_ns()
+        response = await self.client.get(CACHE_STATUS_PATH, params={"repository_url": test_repo})
+        elapsed_ms = (time.perf_counter_ns() - start_ns) / 1e6
+
+        if response.status_code != 200:
+            self.print_error(f"Cache status request failed: {response.status_code}")
+            self.record_result("Cache Functionality", False, "Cache status request failed")
+            return False
+
+        self.print_info(f"First request: {elapsed1:.2f}s", f"Cache probe: {elapsed_ms:.1f}ms")
+
+        if orjson.loads(response.content).get("cached"):
+            self.print_success("Cache is working (analysis is cached)")
+            self.record_result("Cache Functionality", True)
+            return True
+
+        self.print_warning("Analysis was not cached after the first request")
+        self.record_result("Cache Functionality", False, "Not cached")
+        return False
+
     async def test_agentcore_invocation(self) -> bool:
         """Test 8: Verify AgentCore invocation (check logs)."""
         self.print_test("AgentCore invocation verification")
@@ -343,10 +423,10 @@ class APITester:
 
         try:
             self.print_info("Analyzing repository to verify agent invocation...")
-            response = await self.client.post(f"{self.base_url}/api/projects/analyze", json=payload)
+            response = await self.client.post(ANALYZE_PATH, json=payload)
 
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
 
                 # Check if response has agent metadata
                 metadata = data.get("data", {}).get("metadata", {})
@@ -376,17 +456,23 @@ class APITester:
         """Print test summary."""
         self.print_header("TEST SUMMARY")
 
-        passed = sum(1 for r in self.test_results if r["passed"])
-        total = len(self.test_results)
+        passed = self._passed_count
+        skipped = self._skipped_count
+        # Skipped tests count neither as passed nor towards the total
+        total = len(self.test_results) - skipped
 
-        print(f"\n{Colors.BOLD}Results: {passed}/{total} tests passed{Colors.RESET}\n")
+        skipped_note = f" ({skipped} skipped)" if skipped else ""
+        print(
+            f"\n{Colors.BOLD}Results: {passed}/{total} tests passed{skipped_note}{Colors.RESET}\n"
+        )
 
         for result in self.test_results:
-            status = (
-                f"{Colors.GREEN}✓ PASS{Colors.RESET}"
-                if result["passed"]
-                else f"{Colors.RED}✗ FAIL{Colors.RESET}"
-            )
+            if result["passed"] is None:
+                status = f"{Colors.YELLOW}- SKIP{Colors.RESET}"
+            elif result["passed"]:
+                status = f"{Colors.GREEN}✓ PASS{Colors.RESET}"
+            else:
+                status = f"{Colors.RED}✗ FAIL{Colors.RESET}"
             print(f"{status} - {result['test']}")
             if result["message"]:
                 print(f"       {Colors.YELLOW}{result['message']}{Colors.RESET}")
@@ -401,7 +487,7 @@ class APITester:
             return False
 
     async def run_all_tests(self) -> bool:
-        """Run all tests in sequence."""
+        """Run all tests, overlapping the independent ones."""
         self.print_header("BACKEND API LOCAL TESTING")
 
         print(f"{Colors.BOLD}Base URL:{Colors.RESET} {self.base_url}")
@@ -413,19 +499,21 @@ class APITester:
             self.print_info("Run: cd backend && uvicorn app.main:app --reload")
             return False
 
-        # Test 2: Health endpoint
-        await self.test_health_endpoint()
-
+        # Tests 2 and 4-6 are independent of each other and of the analysis
+        # cache, so run them together; their output may interleave
+        self.print_header("HEALTH AND ERROR SCENARIO TESTS")
+        await asyncio.gather(
+            self.test_health_endpoint(),
+            self.test_invalid_url_format(),
+            self.test_repository_not_found(),
+            self.test_private_repository(),
+        )
+
+        # Tests 3, 7 and 8 share the server's analysis cache, so run in order
         # Test 3: Valid repository analysis
         self.print_header("FUNCTIONAL TESTS")
         await self.test_analyze_valid_repository()
 
-        # Test 4-6: Error scenarios
-        self.print_header("ERROR SCENARIO TESTS")
-        await self.test_invalid_url_format()
-        await self.test_repository_not_found()
-        await self.test_private_repository()
-
         # Test 7: Cache functionality
         self.print_header("PERFORMANCE TESTS")
         await self.test_cache_functionality()
@@ -446,11 +534,11 @@ async def main():
     print(f"Make sure the server is running at {base_url}")
     print("To start the server: cd backend && uvicorn app.main:app --reload\n")
 
-    async with APITester(base_url) as tester:
+    async with APITester(base_url, full_cache_test="--full-cache-test" in sys.argv) as tester:
         success = await tester.run_all_tests()
 
     sys.exit(0 if success else 1)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -1,97 +1,122 @@
 #!/usr/bin/env python3
 """Quick test script for a single repository analysis."""
 
-import asyncio
-import json
+import sys
 
 import httpx
+import orjson
+
+# uvloop's libuv-based event loop has lower scheduling overhead; it is a dev
+# dependency on non-Windows platforms, so fall back to asyncio's loop
+try:
+    from uvloop import run
+except ImportError:
+    from asyncio import run
+
+_client: httpx.AsyncClient | None = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Get or create the shared HTTP client, so repeated calls reuse connections."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(timeout=60.0, limits=httpx.Limits(max_keepalive_connections=8))
+    return _client
+
+
+def _add_section(lines: list[str], title: str) -> None:
+    """Append a section header to the report lines."""
+    lines.extend((f"\n{'=' * 70}", title, "=" * 70))
 
 
 async def test_repo(repo_url: str):
     """Test analysis of a single repository."""
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        print(f"\n{'=' * 70}")
-        print(f"Testing: {repo_url}")
-        print(f"{'=' * 70}\n")
-
-        payload = {"repository_url": repo_url}
-
-        try:
-            response = await client.post("http://localhost:8000/api/projects/analyze", json=payload)
-
-            print(f"Status Code: {response.status_code}\n")
-
-            if response.status_code == 200:
-                data = response.json()
-
-                print("SUCCESS!")
-                print(f"\nRequest ID: {data.get('request_id')}")
-
-                analysis = data.get("data", {})
-
-                print(f"\n{'=' * 70}")
-                print("SUMMARY")
-                print(f"{'=' * 70}")
-                summary = analysis.get("summary", "")
-                # Truncate if too long
-                if len(summary) > 500:
-                    print(f"{summary[:500]}...")
-                    print(f"\n[Truncated - Full length: {len(summary)} characters]")
-                else:
-                    print(summary)
-
-                print(f"\n{'=' * 70}")
-                print("TECHNOLOGIES")
-                print(f"{'=' * 70}")
-                technologies = analysis.get("technologies", [])
-                print(f"Count: {len(technologies)}")
-                for tech in technologies:
-                    print(
-                        f"  - {tech.get('name')} ({tech.get('category')}) - Confidence: {tech.get('confidence', 0):.2f}"
-                    )
-
-                print(f"\n{'=' * 70}")
-                print("TAGS")
-                print(f"{'=' * 70}")
-                tags = analysis.get("tags", [])
-                print(f"Count: {len(tags)}")
-                for tag in tags:
-                    print(f"  - {tag.get('name')} ({tag.get('category', 'N/A')})")
-
-                print(f"\n{'=' * 70}")
-                print("KEY FEATURES")
-                print(f"{'=' * 70}")
-                features = analysis.get("key_features", [])
-                print(f"Count: {len(features)}")
-                for i, feature in enumerate(features, 1):
-                    print(f"  {i}. {feature}")
-
-                print(f"\n{'=' * 70}")
-                print("METADATA")
-                print(f"{'=' * 70}")
-                metadata = analysis.get("metadata", {})
-                print(f"Agent: {metadata.get('agent_name')}")
-                print(f"Processing Time: {metadata.get('processing_time_ms')}ms")
-                print(f"Timestamp: {metadata.get('timestamp')}")
-
-                print(f"\n{'=' * 70}")
-                print("RAW RESPONSE (for debugging)")
-                print(f"{'=' * 70}")
-                print(json.dumps(data, indent=2))
+    print(f"\n{'=' * 70}")
+    print(f"Testing: {repo_url}")
+    print(f"{'=' * 70}\n")
 
-            else:
-                print(f"ERROR: {response.status_code}")
-                print(response.text)
+    payload = {"repository_url": repo_url}
 
-        except Exception as e:
-            print(f"EXCEPTION: {e}")
-            import traceback
+    try:
+        response = await get_client().post(
+            "http://localhost:8000/api/projects/analyze", json=payload
+        )
 
-            traceback.print_exc()
+        print(f"Status Code: {response.status_code}\n")
 
+        if response.status_code == 200:
+            data = orjson.loads(response.content)
+
+            # Build the report and write it once; the raw JSON stays as bytes
+            lines = ["SUCCESS!", f"\nRequest ID: {data.get('request_id')}"]
+
+            analysis = data.get("data", {})
+
+            _add_section(lines, "SUMMARY")
+            summary = analysis.get("summary", "")
+            # Truncate if too long
+            if len(summary) > 500:
+                lines.append(f"{summary[:500]}...")
+                lines.append(f"\n[Truncated - Full length: {len(summary)} characters]")
+            else:
+                lines.append(summary)
+
+            _add_section(lines, "TECHNOLOGIES")
+            technologies = analysis.get("technologies", [])
+            lines.append(f"Count: {len(technologies)}")
+            for tech in technologies:
+                lines.append(
+                    f"  - {tech.get('name')} ({tech.get('category')}) - Confidence: {tech.get('confidence', 0):.2f}"
+                )
+
+            _add_section(lines, "TAGS")
+            tags = analysis.get("tags", [])
+            lines.append(f"Count: {len(tags)}")
+            for tag in tags:
+                lines.append(f"  - {tag.get('name')} ({tag.get('category', 'N/A')})")
+
+            _add_section(lines, "KEY FEATURES")
+            features = analysis.get("key_features", [])
+            lines.append(f"Count: {len(features)}")
+            for i, feature in enumerate(features, 1):
+                lines.append(f"  {i}. {feature}")
+
+            _add_section(lines, "METADATA")
+            metadata = analysis.get("metadata", {})
+            lines.append(f"Agent: {metadata.get('agent_name')}")
+            lines.append(f"Processing Time: {metadata.get('processing_time_ms')}ms")
+            lines.append(f"Timestamp: {metadata.get('timestamp')}")
+
+            _add_section(lines, "RAW RESPONSE (for debugging)")
+            lines.append("")
+
+            sys.stdout.flush()
+            sys.stdout.buffer.write(
+                "\n".join(lines).encode() + orjson.dumps(data, option=orjson.OPT_INDENT_2) + b"\n"
+            )
+            sys.stdout.buffer.flush()
+
+        else:
+            print(f"ERROR: {response.status_code}")
+            print(response.text)
+
+    except Exception as e:
+        print(f"EXCEPTION: {e}")
+        import traceback
+
+        traceback.print_exc()
+
+
+async def main(repo_urls: list[str]):
+    """Test each repository in turn, then close the shared client."""
+    try:
+        for repo_url in repo_urls:
+            await test_repo(repo_url)
+    finally:
+        if _client is not None:
+            await _client.aclose()
 
-if __name__ == "__main__":
-    import sys
 
-    repo = sys.argv[1] if len(sys.argv) > 1 else "https://github.com/awslabs/mcp"
-    asyncio.run(test_repo(repo))
+if __name__ == "__main__":
+    repos = sys.argv[1:] or ["https://github.com/awslabs/mcp"]
+    run(main(repos))
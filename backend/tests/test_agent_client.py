@@ -1,28 +1,44 @@
 """Tests for agent client."""
 
+import time
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from app.services.agent_client import AgentCoreClient, AgentRegistry
+from app.models import AgentAnalysisResult
+from app.services.agent_client import AgentCoreClient, AgentRegistry, get_agentcore_client
+from app.services.cache import AnalysisCache
 
 
-@pytest.fixture
-def mock_boto_client():
-    """Mock boto3 client."""
+def _agent_response(body: bytes) -> dict:
+    """Fake invoke_agent_runtime result whose streaming body reads as body."""
+    return {"response": SimpleNamespace(read=lambda: body)}
+
+
+@pytest.fixture(scope="module")
+def mock_boto_factory():
+    """boto3.client patched once for every test in this module."""
     with patch("boto3.client") as mock:
-        client = MagicMock()
-        mock.return_value = client
+        yield mock
+
+
+@pytest.fixture
+def mock_boto_client(mock_boto_factory):
+    """Mock boto3 client, fresh for each test."""
+    get_agentcore_client.cache_clear()
+    client = MagicMock()
+    mock_boto_factory.return_value = client
+    with patch("app.services.agent_client.cache", AnalysisCache()):
         yield client
+    get_agentcore_client.cache_clear()
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_invoke_agent_success(mock_boto_client):
     """Test successful agent invocation."""
     # Setup mock response
-    mock_response = MagicMock()
-    mock_response["response"].read.return_value = b'{"result": "success"}'
-    mock_boto_client.invoke_agent_runtime.return_value = mock_response
+    mock_boto_client.invoke_agent_runtime.return_value = _agent_response(b'{"result": "success"}')
 
     # Invoke agent
     client = AgentCoreClient()
@@ -35,7 +51,7 @@ async def test_invoke_agent_success(mock_boto_client):
     mock_boto_client.invoke_agent_runtime.assert_called_once()
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_invoke_agent_error(mock_boto_client):
     """Test agent invocation error handling."""
     from botocore.exceptions import ClientError
@@ -57,19 +73,108 @@ async def test_invoke_agent_error(mock_boto_client):
     assert "Invalid input" in str(exc_info.value)
 
 
-def test_agent_registry():
-    """Test agent registry."""
-    with patch("app.services.agent_client.settings") as mock_settings:
-        mock_settings.project_intelligence_agent_arn = "arn:test:123"
+@pytest.mark.asyncio(loop_scope="module")
+async def test_invoke_agent_caches_identical_payloads(mock_boto_client):
+    """Test that identical payloads reuse the cached agent response."""
+    mock_boto_client.invoke_agent_runtime.return_value = _agent_response(b'{"result": "success"}')
+
+    client = AgentCoreClient()
+    arn = "arn:aws:bedrock-agentcore:us-west-2:123:runtime/test"
+
+    first = await client.invoke_agent(arn, {"a": 1, "b": 2}, use_cache=True)
+    second = await client.invoke_agent(arn, {"b": 2, "a": 1}, use_cache=True)
+    assert first == second == {"result": "success"}
+    assert first is not second
+    mock_boto_client.invoke_agent_runtime.assert_called_once()
+
+    # Caching is opt-in, and a caller-supplied session gets its own entry
+    await client.invoke_agent(arn, {"a": 1, "b": 2})
+    await client.invoke_agent(arn, {"a": 1, "b": 2}, session_id="s" * 33, use_cache=True)
+    assert mock_boto_client.invoke_agent_runtime.call_count == 3
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_invoke_agent_does_not_cache_failures(mock_boto_client):
+    """Test that responses reporting a failed status are not cached."""
+    mock_boto_client.invoke_agent_runtime.return_value = _agent_response(
+        b'{"status": "failed", "error": "boom"}'
+    )
+
+    client = AgentCoreClient()
+    arn = "arn:aws:bedrock-agentcore:us-west-2:123:runtime/test"
+
+    await client.invoke_agent(arn, {"a": 1}, use_cache=True)
+    await client.invoke_agent(arn, {"a": 1}, use_cache=True)
+    assert mock_boto_client.invoke_agent_runtime.call_count == 2
+
+
+@pytest.fixture(scope="module")
+def agent_arns():
+    """Registry ARNs patched once for all registry tests."""
+    arns = {"project_intelligence": "arn:test:123"}
+    with patch("app.services.agent_client._AGENT_ARNS", arns):
+        yield arns
+
 
-        # Get agent ARN
-        arn = AgentRegistry.get_agent_arn("project_intelligence")
-        assert arn == "arn:test:123"
+@pytest.mark.parametrize("agent_name,expected", [("project_intelligence", "arn:test:123")])
+def test_agent_registry_get_agent_arn(agent_arns, agent_name, expected):
+    """Test looking up a registered agent's ARN."""
+    assert AgentRegistry.get_agent_arn(agent_name) == expected
 
-        # List agents
-        agents = AgentRegistry.list_agents()
-        assert "project_intelligence" in agents
 
-        # Unknown agent
-        with pytest.raises(ValueError):
-            AgentRegistry.get_agent_arn("unknown_agent")
+@pytest.mark.parametrize("agent_name", ["unknown_agent", ""])
+def test_agent_registry_unknown_agent(agent_arns, agent_name):
+    """Test that unknown agents are rejected."""
+    with pytest.raises(ValueError, match="Unknown agent"):
+        AgentRegistry.get_agent_arn(agent_name)
+
+
+def test_agent_registry_list_agents(agent_arns):
+    """Test listing registered agents."""
+    assert AgentRegistry.list_agents() == list(agent_arns)
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_invoke_agent_response_model(mock_boto_client):
+    """Test decoding the agent response straight into a model."""
+    mock_boto_client.invoke_agent_runtime.return_value = _agent_response(
+        b'{"request_id": "abc", "status": "completed", "analysis": {"summary": "Demo",'
+        b' "tech_stack": [{"name": "Python", "category": "language", "confidence": 0.9}],'
+        b' "tags": [{"name": "ai", "category": "domain", "confidence": 0.8}]}}'
+    )
+
+    client = AgentCoreClient()
+    result = await client.invoke_agent(
+        "arn:aws:bedrock-agentcore:us-west-2:123:runtime/test",
+        {"test": "data"},
+        response_model=AgentAnalysisResult,
+    )
+
+    assert isinstance(result, AgentAnalysisResult)
+    assert result.analysis.summary == "Demo"
+    assert result.analysis.tech_stack[0].name == "Python"
+    assert result.analysis.tags[0].name == "ai"
+    assert result.analysis.key_features == []
+
+
+def test_agentcore_client_shared(mock_boto_client):
+    """Test that AgentCoreClient instances share one boto3 client."""
+    assert AgentCoreClient().client is AgentCoreClient().client
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_invoke_agent_timeout(mock_boto_client):
+    """Test that a slow invocation is cut off at the timeout."""
+    mock_boto_client.invoke_agent_runtime.side_effect = lambda **kwargs: time.sleep(0.5)
+
+    client = AgentCoreClient()
+    start = time.perf_counter()
+
+    with pytest.raises(TimeoutError):
+        await client.invoke_agent(
+            "arn:aws:bedrock-agentcore:us-west-2:123:runtime/test",
+            {"test": "data"},
+            timeout_seconds=0.1,
+        )
+
+    assert time.perf_counter() - start < 0.4
@@ -0,0 +1,73 @@
+"""Tests for analysis cache."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from app.services.cache import AnalysisCache
+
+
+@pytest.mark.asyncio
+async def test_cache_get_set():
+    """Test basic get/set/invalidate."""
+    cache = AnalysisCache(max_entries=10)
+
+    assert await cache.get("missing") is None
+
+    await cache.set("key", {"summary": "demo"})
+    assert await cache.get("key") == {"summary": "demo"}
+
+    await cache.invalidate("key")
+    assert await cache.get("key") is None
+
+
+@pytest.mark.asyncio
+async def test_cache_expiry():
+    """Test that entries expire after the TTL."""
+    cache = AnalysisCache(max_entries=10)
+
+    with patch("app.services.cache.time.monotonic", return_value=1000.0):
+        await cache.set("key", "value")
+
+    with patch("app.services.cache.settings") as mock_settings:
+        mock_settings.cache_ttl_seconds = 60
+        with patch("app.services.cache.time.monotonic", return_value=1030.0):
+            assert await cache.get("key") == "value"
+        with patch("app.services.cache.time.monotonic", return_value=1061.0):
+            assert await cache.get("key") is None
+
+
+@pytest.mark.asyncio
+async def test_cache_lru_eviction():
+    """Test that the least recently used entry is evicted at capacity."""
+    cache = AnalysisCache(max_entries=2, shards=1)
+
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+    await cache.get("a")  # "b" is now least recently used
+    await cache.set("c", 3)
+
+    assert await cache.get("a") == 1
+    assert await cache.get("b") is None
+    assert await cache.get("c") == 3
+
+
+def test_cache_concurrent_access():
+    """Test concurrent get/set from worker threads."""
+    cache = AnalysisCache(max_entries=1000)
+
+    async def work(n: int) -> None:
+        for i in range(200):
+            key = f"repo-{n}-{i % 50}"
+            await cache.set(key, i)
+            await cache.get(key)
+
+    def worker(n: int) -> None:
+        asyncio.run(work(n))
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(worker, range(8)))
+
+    assert asyncio.run(cache.get("repo-0-49")) == 199
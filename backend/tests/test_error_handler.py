@@ -1,55 +1,36 @@
 """Tests for error handling service."""
 
-from datetime import datetime
+import json
+import logging
+import sys
 from unittest.mock import MagicMock, patch
 
+import httpx
 import pytest
-from fastapi import HTTPException
+from fastapi import HTTPException, Request
 
-from app.models import ErrorDetail
-from app.services.error_handler import ErrorCode, ErrorHandler
+from app.models import StandardErrorResponse
+from app.services.error_handler import (
+    ErrorCode,
+    ErrorHandler,
+    JsonLogFormatter,
+    _iso_now,
+    global_exception_handler,
+    setup_error_logging,
+)
 
 
 class TestErrorHandler:
     """Test cases for ErrorHandler class."""
 
-    def test_create_error_detail(self):
-        """Test error detail creation."""
-        error_detail = ErrorHandler.create_error_detail(
-            code="TEST_ERROR", message="Test error message", details={"key": "value"}
-        )
-
-        assert error_detail.code == "TEST_ERROR"
-        assert error_detail.message == "Test error message"
-        assert error_detail.details == {"key": "value"}
-        assert error_detail.timestamp is not None
-
-        # Verify timestamp format
-        datetime.fromisoformat(error_detail.timestamp.replace("Z", "+00:00"))
-
-    def test_create_error_detail_no_details(self):
-        """Test error detail creation without details."""
-        error_detail = ErrorHandler.create_error_detail(
-            code="TEST_ERROR", message="Test error message"
-        )
-
-        assert error_detail.code == "TEST_ERROR"
-        assert error_detail.message == "Test error message"
-        assert error_detail.details == {}
-
-    def test_create_error_response(self):
-        """Test error response creation."""
-        error_detail = ErrorDetail(
-            code="TEST_ERROR", message="Test message", details={}, timestamp="2025-10-20T10:00:00Z"
-        )
-
-        error_response = ErrorHandler.create_error_response(
-            request_id="test-123", error_detail=error_detail
-        )
+    def test_error_timestamp_reused_within_second(self):
+        """Test that error timestamps are formatted once per second."""
+        with patch("app.services.error_handler.time.time", side_effect=[1000.1, 1000.9, 1001.2]):
+            first = _iso_now()
+            assert _iso_now() is first
+            assert _iso_now() != first
 
-        assert error_response.success is False
-        assert error_response.error == error_detail
-        assert error_response.request_id == "test-123"
+        assert first == "1970-01-01T00:16:40+00:00"
 
     @patch("app.services.error_handler.logger")
     def test_log_error_basic(self, mock_logger):
@@ -89,6 +70,10 @@ class TestErrorHandler:
         assert extra_data["exception_message"] == "Test exception"
         assert extra_data["context"] == "test"
 
+        # Traceback formatting is deferred to the logging handler
+        assert "traceback" not in extra_data
+        assert call_args[1]["exc_info"] is test_exception
+
     def test_handle_validation_error(self):
         """Test validation error handling."""
         with pytest.raises(HTTPException) as exc_info:
@@ -106,6 +91,14 @@ class TestErrorHandler:
         assert detail["error"]["message"] == "Invalid input"
         assert detail["error"]["details"]["field"] == "value"
 
+    def test_error_detail_matches_standard_response(self):
+        """Test that raised error details keep the StandardErrorResponse shape."""
+        with pytest.raises(HTTPException) as exc_info:
+            ErrorHandler.handle_github_url_error(request_id="test-123", message="Bad URL")
+
+        detail = exc_info.value.detail
+        assert StandardErrorResponse.model_validate(detail).model_dump() == detail
+
     def test_handle_github_url_error(self):
         """Test GitHub URL error handling."""
         with pytest.raises(HTTPException) as exc_info:
@@ -120,6 +113,12 @@ class TestErrorHandler:
         assert detail["error"]["message"] == "Invalid GitHub URL"
         assert "expected_format" in detail["error"]["details"]
 
+        # Editing one error's details must not leak into the next
+        detail["error"]["details"].clear()
+        with pytest.raises(HTTPException) as exc_info:
+            ErrorHandler.handle_github_url_error(request_id="test-456", message="Invalid")
+        assert "expected_format" in exc_info.value.detail["error"]["details"]
+
     def test_handle_repository_not_found(self):
         """Test repository not found error handling."""
         with pytest.raises(HTTPException) as exc_info:
@@ -170,8 +169,6 @@ class TestErrorHandler:
 
     def test_handle_agent_error_timeout_exception(self):
         """Test agent error handling with timeout exception."""
-        import httpx
-
         timeout_exception = httpx.TimeoutException("Request timed out")
 
         with pytest.raises(HTTPException) as exc_info:
@@ -245,10 +242,6 @@ class TestGlobalExceptionHandler:
     @pytest.mark.asyncio
     async def test_global_exception_handler_http_exception(self):
         """Test global handler with HTTPException."""
-        from fastapi import Request
-
-        from app.services.error_handler import global_exception_handler
-
         # Mock request
         request = MagicMock(spec=Request)
         request.state.request_id = "test-123"
@@ -264,10 +257,6 @@ class TestGlobalExceptionHandler:
     @pytest.mark.asyncio
     async def test_global_exception_handler_generic_exception(self):
         """Test global handler with generic exception."""
-        from fastapi import Request
-
-        from app.services.error_handler import global_exception_handler
-
         # Mock request
         request = MagicMock(spec=Request)
         request.state.request_id = "test-123"
@@ -287,8 +276,6 @@ class TestErrorLoggingSetup:
     @patch("app.services.error_handler.logging")
     def test_setup_error_logging(self, mock_logging):
         """Test error logging setup."""
-        from app.services.error_handler import setup_error_logging
-
         setup_error_logging()
 
         # Verify logging configuration
@@ -302,3 +289,20 @@ class TestErrorLoggingSetup:
         assert "httpx" in logger_names
         assert "urllib3" in logger_names
         assert "app" in logger_names
+
+    def test_json_log_formatter(self):
+        """Test JSON log formatting with extra fields and exceptions."""
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            exc_info = sys.exc_info()
+
+        record = logging.LogRecord("app", logging.ERROR, __file__, 1, "Failed %s", ("x",), exc_info)
+        record.request_id = "test-123"
+
+        entry = json.loads(JsonLogFormatter().format(record))
+
+        assert entry["level"] == "ERROR"
+        assert entry["message"] == "Failed x"
+        assert entry["request_id"] == "test-123"
+        assert "ValueError: boom" in entry["traceback"]
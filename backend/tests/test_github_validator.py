@@ -1,23 +1,39 @@
 """Tests for GitHub URL validation service."""
 
+import asyncio
+import time
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from app.services.github_validator import GitHubValidator, RateLimitInfo
+from app.services.github_validator import GitHubValidator, RateLimitInfo, RepositoryLookup
+
+
+@pytest.fixture(scope="module")
+def shared_validator():
+    """One validator for the whole module; tests reset its mutable state."""
+    return GitHubValidator()
 
 
 class TestGitHubValidator:
     """Test cases for GitHubValidator class."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.validator = GitHubValidator()
-
-    def test_validate_url_valid_cases(self):
-        """Test URL validation with valid GitHub URLs."""
-        valid_urls = [
+    @pytest.fixture(autouse=True)
+    def _validator(self, shared_validator):
+        """Give each test the shared validator with empty caches."""
+        shared_validator._rate_limit_cache = None
+        shared_validator._cache_expiry = None
+        # Locks bind to the first event loop they wait on
+        shared_validator._rate_limit_lock = asyncio.Lock()
+        shared_validator._exists_cache.clear()
+        shared_validator._etag_cache.clear()
+        shared_validator._head_sha_cache.clear()
+        self.validator = shared_validator
+
+    @pytest.mark.parametrize(
+        "url",
+        [
             "https://github.com/owner/repo",
             "https://github.com/owner/repo/",
             "http://github.com/owner/repo",
@@ -26,18 +42,19 @@ class TestGitHubValidator:
             "https://github.com/user123/repo_name",
             "https://github.com/a/b",
             "https://github.com/very-long-username-with-39-chars/repo",
-        ]
-
-        for url in valid_urls:
-            result = self.validator.validate_url(url)
-            assert result.is_valid, f"URL should be valid: {url}"
-            assert result.owner is not None
-            assert result.repo is not None
-            assert result.error_message is None
-
-    def test_validate_url_invalid_cases(self):
-        """Test URL validation with invalid GitHub URLs."""
-        invalid_urls = [
+        ],
+    )
+    def test_validate_url_valid_cases(self, url):
+        """Test URL validation with valid GitHub URLs."""
+        result = self.validator.validate_url(url)
+        assert result.is_valid
+        assert result.owner is not None
+        assert result.repo is not None
+        assert result.error_message is None
+
+    @pytest.mark.parametrize(
+        "url",
+        [
             "",  # Empty string
             "not-a-url",  # Not a URL
             "https://gitlab.com/owner/repo",  # Wrong domain
@@ -48,12 +65,13 @@ class TestGitHubValidator:
             "https://github.com/owner/.invalid",  # Invalid repo (starts with period)
             "https://github.com/owner/repo/extra/path",  # Extra path
             "ftp://github.com/owner/repo",  # Wrong protocol
-        ]
-
-        for url in invalid_urls:
-            result = self.validator.validate_url(url)
-            assert not result.is_valid, f"URL should be invalid: {url}"
-            assert result.error_message is not None
+        ],
+    )
+    def test_validate_url_invalid_cases(self, url):
+        """Test URL validation with invalid GitHub URLs."""
+        result = self.validator.validate_url(url)
+        assert not result.is_valid
+        assert result.error_message is not None
 
     def test_validate_url_edge_cases(self):
         """Test URL validation edge cases."""
@@ -73,172 +91,372 @@ class TestGitHubValidator:
         assert not result.is_valid
         assert "Invalid GitHub username" in result.error_message
 
-    def test_github_name_validation(self):
-        """Test GitHub username validation rules."""
-        # Valid usernames
-        valid_names = ["user", "user123", "test-user", "a", "user-123"]
-        for name in valid_names:
-            assert self.validator._is_valid_github_name(name), f"Should be valid: {name}"
+    def test_validate_urls_batch(self):
+        """Test batch validation keeps order and reuses repeated results."""
+        urls = [
+            "https://github.com/owner/repo",
+            "not-a-url",
+            "https://github.com/owner/repo",
+        ]
+
+        results = self.validator.validate_urls(urls)
+
+        assert [result.is_valid for result in results] == [True, False, True]
+        assert results[0] is results[2]
+        assert results[0].owner == "owner"
+
+    @pytest.mark.parametrize("name", ["user", "user123", "test-user", "a", "user-123"])
+    def test_github_name_validation_valid(self, name):
+        """Test GitHub username validation accepts valid names."""
+        assert self.validator._is_valid_github_name(name)
 
-        # Invalid usernames
-        invalid_names = [
+    @pytest.mark.parametrize(
+        "name",
+        [
             "",  # Empty
             "-user",  # Starts with hyphen
             "user-",  # Ends with hyphen
             "user--name",  # Double hyphen
             "a" * 40,  # Too long
             "user@name",  # Invalid character
-        ]
-        for name in invalid_names:
-            assert not self.validator._is_valid_github_name(name), f"Should be invalid: {name}"
-
-    def test_repo_name_validation(self):
-        """Test GitHub repository name validation rules."""
-        # Valid repo names
-        valid_names = ["repo", "repo-name", "repo_name", "repo.name", "123repo", "a"]
-        for name in valid_names:
-            assert self.validator._is_valid_repo_name(name), f"Should be valid: {name}"
-
-        # Invalid repo names
-        invalid_names = [
+        ],
+    )
+    def test_github_name_validation_invalid(self, name):
+        """Test GitHub username validation rejects invalid names."""
+        assert not self.validator._is_valid_github_name(name)
+
+    @pytest.mark.parametrize(
+        "name", ["repo", "repo-name", "repo_name", "repo.name", "123repo", "a"]
+    )
+    def test_repo_name_validation_valid(self, name):
+        """Test GitHub repository name validation accepts valid names."""
+        assert self.validator._is_valid_repo_name(name)
+
+    @pytest.mark.parametrize(
+        "name",
+        [
             "",  # Empty
             ".repo",  # Starts with period
             "-repo",  # Starts with hyphen
             "a" * 101,  # Too long
             "repo@name",  # Invalid character
-        ]
-        for name in invalid_names:
-            assert not self.validator._is_valid_repo_name(name), f"Should be invalid: {name}"
+        ],
+    )
+    def test_repo_name_validation_invalid(self, name):
+        """Test GitHub repository name validation rejects invalid names."""
+        assert not self.validator._is_valid_repo_name(name)
+
+    @pytest.fixture
+    def mock_client(self):
+        """Validator HTTP client whose get and post return one shared 200 response."""
+        mock_response = MagicMock(status_code=200, headers={})
+        with patch.object(self.validator, "_client") as client:
+            client.get = AsyncMock(return_value=mock_response)
+            client.post = AsyncMock(return_value=mock_response)
+            yield client
 
     @pytest.mark.asyncio
-    async def test_check_repository_exists_success(self):
+    async def test_check_repository_exists_success(self, mock_client):
         """Test successful repository existence check."""
-        with patch.object(self.validator, "_client") as mock_client:
-            # Mock successful response
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.headers = {
-                "x-ratelimit-remaining": "4999",
-                "x-ratelimit-limit": "5000",
-                "x-ratelimit-reset": str(int(datetime.now().timestamp()) + 3600),
-            }
-            mock_client.get = AsyncMock(return_value=mock_response)
-
-            # Mock rate limit check
-            with patch.object(self.validator, "get_rate_limit_info") as mock_rate_limit:
-                mock_rate_limit.return_value = RateLimitInfo(
-                    is_limited=False, remaining=4999, limit=5000
-                )
+        mock_client.get.return_value.headers = {
+            "x-ratelimit-remaining": "4999",
+            "x-ratelimit-limit": "5000",
+            "x-ratelimit-reset": str(int(datetime.now().timestamp()) + 3600),
+        }
 
-                result = await self.validator.check_repository_exists("owner", "repo")
-                assert result is True
+        result = await self.validator.check_repository_exists("owner", "repo")
+        assert result is True
 
-                # Verify API call
-                mock_client.get.assert_called_once()
-                call_args = mock_client.get.call_args
-                assert "https://api.github.com/repos/owner/repo" in call_args[0]
+        # Verify API call
+        mock_client.get.assert_called_once()
+        call_args = mock_client.get.call_args
+        assert "https://api.github.com/repos/owner/repo" in call_args[0]
 
     @pytest.mark.asyncio
-    async def test_check_repository_exists_not_found(self):
+    async def test_check_repository_exists_not_found(self, mock_client):
         """Test repository not found case."""
-        with patch.object(self.validator, "_client") as mock_client:
-            # Mock 404 response
-            mock_response = MagicMock()
-            mock_response.status_code = 404
-            mock_response.headers = {}
-            mock_client.get = AsyncMock(return_value=mock_response)
-
-            # Mock rate limit check
-            with patch.object(self.validator, "get_rate_limit_info") as mock_rate_limit:
-                mock_rate_limit.return_value = RateLimitInfo(
-                    is_limited=False, remaining=4999, limit=5000
-                )
-
-                result = await self.validator.check_repository_exists("owner", "nonexistent")
-                assert result is False
+        mock_client.get.return_value.status_code = 404
+
+        result = await self.validator.check_repository_exists("owner", "nonexistent")
+        assert result is False
 
     @pytest.mark.asyncio
-    async def test_check_repository_exists_rate_limited(self):
+    async def test_check_repository_exists_rate_limited(self, mock_client):
         """Test rate limit handling."""
-        # Mock rate limit check to return limited status
-        with patch.object(self.validator, "get_rate_limit_info") as mock_rate_limit:
-            reset_time = datetime.now()
-            mock_rate_limit.return_value = RateLimitInfo(
-                is_limited=True, reset_time=reset_time, remaining=0, limit=5000
-            )
+        # Rate limit status cached from earlier response headers
+        self.validator._rate_limit_cache = RateLimitInfo(
+            is_limited=True, reset_time=datetime.now(), remaining=0, limit=5000
+        )
+        self.validator._cache_expiry = datetime.now().replace(year=2030)  # Far future
 
-            with pytest.raises(Exception) as exc_info:
-                await self.validator.check_repository_exists("owner", "repo")
+        with pytest.raises(Exception) as exc_info:
+            await self.validator.check_repository_exists("owner", "repo")
 
-            assert "rate limit exceeded" in str(exc_info.value).lower()
+        assert "rate limit exceeded" in str(exc_info.value).lower()
+        mock_client.get.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_check_repository_exists_with_auth(self):
+    async def test_check_repository_exists_with_auth(self, mock_client):
         """Test repository check with authentication."""
         with patch("app.services.github_validator.settings") as mock_settings:
             mock_settings.github_token = "github_pat_valid_token"
 
-            with patch.object(self.validator, "_client") as mock_client:
-                mock_response = MagicMock()
-                mock_response.status_code = 200
-                mock_response.headers = {}
-                mock_client.get = AsyncMock(return_value=mock_response)
+            await self.validator.check_repository_exists("owner", "repo")
 
-                with patch.object(self.validator, "get_rate_limit_info") as mock_rate_limit:
-                    mock_rate_limit.return_value = RateLimitInfo(
-                        is_limited=False, remaining=4999, limit=5000
-                    )
+        # Verify authorization header was included
+        headers = mock_client.get.call_args[1]["headers"]
+        assert headers["Authorization"] == "Bearer github_pat_valid_token"
 
-                    await self.validator.check_repository_exists("owner", "repo")
+    @pytest.mark.asyncio
+    async def test_check_repository_exists_uses_etag(self, mock_client):
+        """Test conditional requests with a remembered ETag."""
+        mock_response = mock_client.get.return_value
+        mock_response.headers = {"etag": '"abc123"'}
+
+        assert await self.validator.check_repository_exists("owner", "repo") is True
+        assert "If-None-Match" not in mock_client.get.call_args[1]["headers"]
+
+        # Unchanged repository answers 304 to the conditional request
+        self.validator._exists_cache.clear()
+        mock_response.status_code = 304
+        mock_response.headers = {}
+        assert await self.validator.check_repository_exists("owner", "repo") is True
+        assert mock_client.get.call_args[1]["headers"]["If-None-Match"] == '"abc123"'
+
+        # A repository that disappears forgets its ETag
+        self.validator._exists_cache.clear()
+        mock_response.status_code = 404
+        assert await self.validator.check_repository_exists("owner", "repo") is False
+        assert ("owner", "repo") not in self.validator._etag_cache
 
-                    # Verify authorization header was included
-                    call_args = mock_client.get.call_args
-                    headers = call_args[1]["headers"]
-                    assert "Authorization" in headers
-                    assert headers["Authorization"] == "Bearer github_pat_valid_token"
+    @pytest.mark.asyncio
+    async def test_check_repository_exists_cached(self, mock_client):
+        """Test that existence results are reused until they expire."""
+        mock_response = mock_client.get.return_value
+        mock_response.status_code = 404
+
+        assert await self.validator.check_repository_exists("owner", "repo") is False
+        assert await self.validator.check_repository_exists("owner", "repo") is False
+        mock_client.get.assert_called_once()
+
+        # Missing repositories are rechecked after the shorter TTL
+        with patch(
+            "app.services.github_validator.time.monotonic",
+            return_value=time.monotonic() + GitHubValidator.NOT_FOUND_TTL_SECONDS + 1,
+        ):
+            mock_response.status_code = 200
+            assert await self.validator.check_repository_exists("owner", "repo") is True
+        assert mock_client.get.call_count == 2
 
     @pytest.mark.asyncio
-    async def test_get_rate_limit_info_success(self):
+    async def test_known_to_exist(self, mock_client):
+        """Test that only a cached positive result counts as known."""
+        mock_response = mock_client.get.return_value
+        mock_response.status_code = 404
+
+        assert self.validator.known_to_exist("owner", "repo") is False
+        await self.validator.check_repository_exists("owner", "repo")
+        assert self.validator.known_to_exist("owner", "repo") is False
+
+        self.validator._remember_exists("owner", "repo", True)
+        assert self.validator.known_to_exist("owner", "repo") is True
+        mock_client.get.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_check_repository_exists_persisted(self, tmp_path):
+        """Test that existence results and ETags survive a new validator."""
+        with patch("app.services.github_validator.settings") as mock_settings:
+            mock_settings.github_token = None
+            mock_settings.redis_url = None
+            mock_settings.github_cache_path = str(tmp_path / "github.sqlite3")
+
+            async with GitHubValidator() as validator:
+                with patch.object(validator, "_client") as mock_client:
+                    mock_response = MagicMock()
+                    mock_response.status_code = 200
+                    mock_response.headers = {"etag": '"abc123"'}
+                    mock_client.get = AsyncMock(return_value=mock_response)
+
+                    assert await validator.check_repository_exists("owner", "repo") is True
+
+            restarted = GitHubValidator()
+            with patch.object(restarted, "_client") as mock_client:
+                mock_client.get = AsyncMock()
+
+                assert await restarted.check_repository_exists("owner", "repo") is True
+                mock_client.get.assert_not_called()
+            assert restarted._etag_cache[("owner", "repo")] == '"abc123"'
+            await restarted.__aexit__(None, None, None)
+
+    @pytest.mark.asyncio
+    async def test_check_repositories_exist(self, mock_client):
+        """Test batched repository existence check via GraphQL."""
+        mock_client.post.return_value.json.return_value = {
+            "data": {"r0": {"defaultBranchRef": {"target": {"oid": "abc123"}}}, "r1": None},
+            "errors": [{"type": "NOT_FOUND", "path": ["r1"]}],
+        }
+
+        with patch("app.services.github_validator.settings") as mock_settings:
+            mock_settings.github_token = "github_pat_valid_token"
+
+            result = await self.validator.check_repositories_exist(
+                [("owner", "repo"), ("owner", "missing"), ("owner", "repo")]
+            )
+
+        assert result == {
+            ("owner", "repo"): RepositoryLookup(True, "abc123"),
+            ("owner", "missing"): RepositoryLookup(False),
+        }
+        mock_client.post.assert_called_once()
+        # The head SHA is reused without a REST request
+        assert await self.validator.get_head_sha("owner", "repo") == "abc123"
+        mock_client.get.assert_not_called()
+        variables = mock_client.post.call_args[1]["json"]["variables"]
+        assert variables == {"o0": "owner", "n0": "repo", "o1": "owner", "n1": "missing"}
+
+    @pytest.mark.asyncio
+    async def test_check_repositories_exist_leaves_other_errors_unresolved(self, mock_client):
+        """Test that only NOT_FOUND errors mark a repository as missing."""
+        mock_client.post.return_value.json.return_value = {
+            "data": {"r0": None, "r1": None},
+            "errors": [
+                {"type": "FORBIDDEN", "path": ["r0"]},
+                {"type": "NOT_FOUND", "path": ["r1"]},
+            ],
+        }
+
+        with patch("app.services.github_validator.settings") as mock_settings:
+            mock_settings.github_token = "github_pat_valid_token"
+
+            result = await self.validator.check_repositories_exist(
+                [("owner", "private"), ("owner", "missing")]
+            )
+
+        assert result == {("owner", "missing"): RepositoryLookup(False)}
+        assert ("owner", "private") not in self.validator._exists_cache
+
+    @pytest.mark.asyncio
+    async def test_check_repositories_exist_without_data(self, mock_client):
+        """Test that a GraphQL response without data raises."""
+        mock_client.post.return_value.json.return_value = {
+            "data": None,
+            "errors": [{"type": "INTERNAL", "message": "Something went wrong"}],
+        }
+
+        with patch("app.services.github_validator.settings") as mock_settings:
+            mock_settings.github_token = "github_pat_valid_token"
+
+            with pytest.raises(Exception, match="no data"):
+                await self.validator.check_repositories_exist([("owner", "repo")])
+
+    @pytest.mark.asyncio
+    async def test_check_repositories_exist_without_token(self):
+        """Test that batched checks resolve nothing without a token."""
+        with patch("app.services.github_validator.settings") as mock_settings:
+            mock_settings.github_token = ""
+
+            assert await self.validator.check_repositories_exist([("owner", "repo")]) == {}
+
+    @pytest.mark.asyncio
+    async def test_get_head_sha(self, mock_client):
+        """Test head commit SHA lookup."""
+        mock_response = mock_client.get.return_value
+        mock_response.text = "0123456789abcdef0123456789abcdef01234567"
+
+        sha = await self.validator.get_head_sha("owner", "repo")
+        assert sha == "0123456789abcdef0123456789abcdef01234567"
+
+        call_args = mock_client.get.call_args
+        assert "https://api.github.com/repos/owner/repo/commits/HEAD" in call_args[0]
+        assert call_args[1]["headers"]["Accept"] == "application/vnd.github.sha"
+
+        # The lookup also records that the repository exists
+        assert self.validator.known_to_exist("owner", "repo") is True
+
+        # Empty repositories have no head commit
+        mock_response.status_code = 409
+        assert await self.validator.get_head_sha("owner", "empty") is None
+
+        mock_response.status_code = 404
+        assert await self.validator.get_head_sha("owner", "missing") is None
+        assert await self.validator.check_repository_exists("owner", "missing") is False
+        assert mock_client.get.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_get_head_sha_cached(self, mock_client):
+        """Test that head commit SHAs are reused until they expire."""
+        mock_client.get.return_value.text = "0123456789abcdef0123456789abcdef01234567"
+
+        assert await self.validator.get_head_sha("owner", "repo") is not None
+        assert await self.validator.get_head_sha("owner", "repo") is not None
+        mock_client.get.assert_called_once()
+
+        with patch(
+            "app.services.github_validator.time.monotonic",
+            return_value=time.monotonic() + GitHubValidator.HEAD_SHA_TTL_SECONDS + 1,
+        ):
+            await self.validator.get_head_sha("owner", "repo")
+        assert mock_client.get.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_get_head_sha_rate_limited(self, mock_client):
+        """Test that no head commit lookup is made while rate limited."""
+        with patch.object(self.validator, "is_rate_limited", return_value=(True, None)):
+            assert await self.validator.get_head_sha("owner", "repo") is None
+        mock_client.get.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_rate_limit_info_success(self, mock_client):
         """Test successful rate limit info retrieval."""
-        with patch.object(self.validator, "_client") as mock_client:
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.json.return_value = {
-                "resources": {
-                    "core": {
-                        "limit": 5000,
-                        "remaining": 4999,
-                        "reset": int(datetime.now().timestamp()) + 3600,
-                    }
+        mock_client.get.return_value.json.return_value = {
+            "resources": {
+                "core": {
+                    "limit": 5000,
+                    "remaining": 4999,
+                    "reset": int(datetime.now().timestamp()) + 3600,
                 }
             }
-            mock_client.get = AsyncMock(return_value=mock_response)
+        }
 
-            rate_limit_info = await self.validator.get_rate_limit_info()
+        rate_limit_info = await self.validator.get_rate_limit_info()
 
-            assert not rate_limit_info.is_limited
-            assert rate_limit_info.remaining == 4999
-            assert rate_limit_info.limit == 5000
-            assert rate_limit_info.reset_time is not None
+        assert not rate_limit_info.is_limited
+        assert rate_limit_info.remaining == 4999
+        assert rate_limit_info.limit == 5000
+        assert rate_limit_info.reset_time is not None
 
     @pytest.mark.asyncio
-    async def test_get_rate_limit_info_limited(self):
+    async def test_get_rate_limit_info_limited(self, mock_client):
         """Test rate limit info when limited."""
-        with patch.object(self.validator, "_client") as mock_client:
-            reset_timestamp = int(datetime.now().timestamp()) + 3600
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.json.return_value = {
-                "resources": {"core": {"limit": 5000, "remaining": 0, "reset": reset_timestamp}}
+        reset_timestamp = int(datetime.now().timestamp()) + 3600
+        mock_client.get.return_value.json.return_value = {
+            "resources": {"core": {"limit": 5000, "remaining": 0, "reset": reset_timestamp}}
+        }
+
+        rate_limit_info = await self.validator.get_rate_limit_info()
+
+        assert rate_limit_info.is_limited
+        assert rate_limit_info.remaining == 0
+        assert rate_limit_info.limit == 5000
+        assert rate_limit_info.reset_time is not None
+
+    @pytest.mark.asyncio
+    async def test_get_rate_limit_info_single_flight(self, mock_client):
+        """Test that concurrent cache misses share one rate limit request."""
+        mock_client.get.return_value.json.return_value = {
+            "resources": {
+                "core": {
+                    "limit": 5000,
+                    "remaining": 4999,
+                    "reset": int(datetime.now().timestamp()) + 3600,
+                }
             }
-            mock_client.get = AsyncMock(return_value=mock_response)
+        }
 
-            rate_limit_info = await self.validator.get_rate_limit_info()
+        results = await asyncio.gather(*(self.validator.get_rate_limit_info() for _ in range(5)))
 
-            assert rate_limit_info.is_limited
-            assert rate_limit_info.remaining == 0
-            assert rate_limit_info.limit == 5000
-            assert rate_limit_info.reset_time is not None
+        assert all(info.remaining == 4999 for info in results)
+        mock_client.get.assert_called_once()
 
     def test_is_rate_limited_no_cache(self):
         """Test rate limit check with no cached data."""
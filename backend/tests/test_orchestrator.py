@@ -0,0 +1,183 @@
+"""Tests for multi-agent orchestrator."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.models import AgentTask, WorkflowRequest
+from app.services.orchestrator import AgentOrchestrator, _dependency_levels
+
+
+@pytest.fixture
+def orchestrator():
+    """Orchestrator whose agents echo their ARN, except "broken" which fails."""
+
+    async def invoke_agent(agent_arn, payload, use_cache=True):
+        if agent_arn == "broken":
+            raise RuntimeError("agent unavailable")
+        return {"agent": agent_arn, "input": payload}
+
+    with (
+        patch("app.services.orchestrator.AgentCoreClient") as mock_client_cls,
+        patch("app.services.orchestrator.AgentRegistry") as mock_registry,
+    ):
+        mock_client_cls.return_value.invoke_agent = AsyncMock(side_effect=invoke_agent)
+        mock_registry.get_agent_arn.side_effect = lambda name: name
+        yield AgentOrchestrator()
+
+
+@pytest.mark.asyncio
+async def test_parallel_workflow_passes_dependency_results(orchestrator):
+    """Test that parallel tasks receive results from earlier levels."""
+    workflow = WorkflowRequest(
+        workflow_type="parallel",
+        tasks=[
+            AgentTask(agent_name="a", input_data={}),
+            AgentTask(agent_name="b", input_data={}),
+            AgentTask(agent_name="c", input_data={}, depends_on=["a", "b"]),
+        ],
+    )
+
+    result = await orchestrator.execute_workflow(workflow)
+
+    assert result["errors"] == {}
+    assert result["execution_order"] == ["a", "b", "c"]
+    assert result["results"]["c"]["input"]["a_result"] == {"agent": "a", "input": {}}
+
+
+@pytest.mark.asyncio
+async def test_parallel_workflow_isolates_failures(orchestrator):
+    """Test that one failing task does not abort the rest of the workflow."""
+    workflow = WorkflowRequest(
+        workflow_type="parallel",
+        tasks=[
+            AgentTask(agent_name="a", input_data={}),
+            AgentTask(agent_name="broken", input_data={}),
+            AgentTask(agent_name="c", input_data={}, depends_on=["broken"]),
+        ],
+    )
+
+    result = await orchestrator.execute_workflow(workflow)
+
+    assert list(result["results"]) == ["a"]
+    assert result["errors"]["broken"] == "RuntimeError: agent unavailable"
+    assert "dependencies failed" in result["errors"]["c"]
+
+
+def test_get_orchestrator_singleton():
+    """Test that get_orchestrator returns singleton instance."""
+    from app.services.orchestrator import get_orchestrator
+
+    with patch("app.services.orchestrator.AgentCoreClient"):
+        orchestrator1 = get_orchestrator()
+        orchestrator2 = get_orchestrator()
+
+    assert orchestrator1 is orchestrator2  # Same instance
+
+
+def test_group_by_dependencies(orchestrator):
+    """Test dependency levels and cycle detection."""
+    tasks = [
+        AgentTask(agent_name="c", input_data={}, depends_on=["a", "b"]),
+        AgentTask(agent_name="a", input_data={}),
+        AgentTask(agent_name="b", input_data={}, depends_on=["a"]),
+    ]
+
+    groups = orchestrator._group_by_dependencies(tasks)
+    assert [[task.agent_name for task in group] for group in groups] == [["a"], ["b"], ["c"]]
+
+    cyclic = [
+        AgentTask(agent_name="a", input_data={}, depends_on=["b"]),
+        AgentTask(agent_name="b", input_data={}, depends_on=["a"]),
+    ]
+    with pytest.raises(ValueError, match="Circular dependency"):
+        orchestrator._group_by_dependencies(cyclic)
+
+
+@pytest.mark.asyncio
+async def test_parallel_workflow_starts_tasks_without_level_barrier(orchestrator):
+    """Test that a task starts once its own dependencies finish."""
+    c_started = asyncio.Event()
+
+    async def invoke_agent(agent_arn, payload, use_cache=True):
+        if agent_arn == "a":
+            # Only finishes after "c" starts, which a level barrier would prevent
+            await asyncio.wait_for(c_started.wait(), timeout=1)
+        if agent_arn == "c":
+            c_started.set()
+        return agent_arn
+
+    orchestrator.client.invoke_agent.side_effect = invoke_agent
+    workflow = WorkflowRequest(
+        workflow_type="parallel",
+        tasks=[
+            AgentTask(agent_name="a", input_data={}),
+            AgentTask(agent_name="b", input_data={}),
+            AgentTask(agent_name="c", input_data={}, depends_on=["b"]),
+        ],
+    )
+
+    result = await orchestrator.execute_workflow(workflow)
+
+    assert result["errors"] == {}
+    assert result["execution_order"] == ["a", "b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_cache_task_uses_response_cache(orchestrator):
+    """Test that only tasks marked cache use the response cache."""
+    workflow = WorkflowRequest(
+        workflow_type="sequential",
+        tasks=[
+            AgentTask(agent_name="a", input_data={}),
+            AgentTask(agent_name="b", input_data={}, cache=True),
+        ],
+    )
+
+    await orchestrator.execute_workflow(workflow)
+
+    calls = orchestrator.client.invoke_agent.call_args_list
+    assert [call.kwargs["use_cache"] for call in calls] == [False, True]
+
+
+def test_group_by_dependencies_reuses_levels_for_same_shape(orchestrator):
+    """Test that workflows with the same shape share memoized levels."""
+    _dependency_levels.cache_clear()
+
+    for value in range(3):
+        tasks = [
+            AgentTask(agent_name="a", input_data={"value": value}),
+            AgentTask(agent_name="b", input_data={}, depends_on=["a"]),
+        ]
+        groups = orchestrator._group_by_dependencies(tasks)
+        assert groups == [[tasks[0]], [tasks[1]]]
+
+    assert _dependency_levels.cache_info().hits == 2
+
+
+@pytest.mark.asyncio
+async def test_parallel_workflow_caps_concurrent_invocations(orchestrator):
+    """Test that parallel tasks never exceed the concurrency limit."""
+    active = 0
+    peak = 0
+
+    async def invoke_agent(agent_arn, payload, use_cache=True):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return agent_arn
+
+    orchestrator.client.invoke_agent.side_effect = invoke_agent
+    orchestrator._semaphore = asyncio.Semaphore(2)
+    workflow = WorkflowRequest(
+        workflow_type="parallel",
+        tasks=[AgentTask(agent_name=str(i), input_data={}) for i in range(6)],
+    )
+
+    result = await orchestrator.execute_workflow(workflow)
+
+    assert len(result["results"]) == 6
+    assert peak == 2